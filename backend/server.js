@@ -9,7 +9,7 @@ const app = express();
 const PORT = process.env.PORT || 3001;
 
 // Middleware
-app.use(cors());
+app.use(cors({ exposedHeaders: ['X-Next-Cursor'] }));
 app.use(express.json());
 
 // Database setup
@@ -40,6 +40,15 @@ db.serialize(() => {
     }
   });
 
+  // Migrate existing table: add scheduling weight (share of each summarizer run)
+  db.run(`
+    ALTER TABLE podcasts ADD COLUMN weight REAL DEFAULT 1
+  `, (err) => {
+    if (err && !err.message.includes('duplicate column')) {
+      console.error('Migration warning:', err.message);
+    }
+  });
+
   // User settings table
   db.run(`
     CREATE TABLE IF NOT EXISTS user_settings (
@@ -50,6 +59,41 @@ db.serialize(() => {
     )
   `);
 
+  // Recipients and their podcast subscriptions (all_podcasts = 1 receives
+  // every podcast, otherwise only the subscribed ones)
+  db.run(`
+    CREATE TABLE IF NOT EXISTS recipients (
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      email TEXT NOT NULL UNIQUE,
+      name TEXT,
+      digest INTEGER DEFAULT 0,
+      all_podcasts INTEGER DEFAULT 1,
+      created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+  `);
+
+  // Migrate existing table: "every podcast" used to mean "no subscriptions"
+  db.run(`
+    ALTER TABLE recipients ADD COLUMN all_podcasts INTEGER DEFAULT 1
+  `, (err) => {
+    if (!err) {
+      db.run('UPDATE recipients SET all_podcasts = 0 WHERE id IN (SELECT recipient_id FROM subscriptions)');
+    } else if (!err.message.includes('duplicate column')) {
+      console.error('Migration warning:', err.message);
+    }
+  });
+
+  db.run(`
+    CREATE TABLE IF NOT EXISTS subscriptions (
+      recipient_id INTEGER NOT NULL,
+      podcast_id INTEGER NOT NULL,
+      created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+      PRIMARY KEY (recipient_id, podcast_id)
+    )
+  `);
+
+  db.run('CREATE INDEX IF NOT EXISTS idx_subscriptions_podcast ON subscriptions(podcast_id)');
+
   // Processed videos table (same as before)
   db.run(`
     CREATE TABLE IF NOT EXISTS processed_videos (
@@ -62,8 +106,44 @@ db.serialize(() => {
       FOREIGN KEY (podcast_id) REFERENCES podcasts(id)
     )
   `);
+
+  // Generated summaries and their full-text index (kept in sync by triggers
+  // created by the summarizer, see VideoDatabase in summarizer.py)
+  db.run(`
+    CREATE TABLE IF NOT EXISTS summaries (
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      video_id TEXT NOT NULL UNIQUE,
+      podcast_id INTEGER,
+      title TEXT,
+      url TEXT,
+      summary TEXT NOT NULL,
+      transcript TEXT,
+      created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+  `);
+
+  db.run(`
+    CREATE VIRTUAL TABLE IF NOT EXISTS summaries_fts USING fts5(
+      title, summary, transcript,
+      content='summaries', content_rowid='id',
+      tokenize='porter unicode61'
+    )
+  `, (err) => {
+    if (err) {
+      console.error('Full-text search unavailable:', err.message);
+    }
+  });
 });
 
+// Turn free text into an FTS5 query matching all words (prefix match on the last)
+function toMatchExpression(query) {
+  const terms = query.split(/\s+/).filter(Boolean).map((word) => `"${word.replace(/"/g, '""')}"`);
+  if (terms.length > 0) {
+    terms[terms.length - 1] += '*';
+  }
+  return terms.join(' ');
+}
+
 // ============== API ROUTES ==============
 
 // Health check
@@ -274,6 +354,7 @@ app.delete('/api/podcasts/:id', (req, res) => {
       return res.status(404).json({ error: 'Podcast not found' });
     }
 
+    db.run('DELETE FROM subscriptions WHERE podcast_id = ?', [id]);
     res.json({ message: 'Podcast deleted successfully' });
   });
 });
@@ -365,30 +446,207 @@ app.delete('/api/settings/:key', (req, res) => {
   });
 });
 
+// ============== RECIPIENTS ROUTES ==============
+
+// Get all recipients with the podcast IDs they subscribe to
+app.get('/api/recipients', (req, res) => {
+  db.all(`
+    SELECT r.*, GROUP_CONCAT(s.podcast_id) AS podcast_ids
+    FROM recipients r
+    LEFT JOIN subscriptions s ON s.recipient_id = r.id
+    GROUP BY r.id
+    ORDER BY r.email
+  `, (err, rows) => {
+    if (err) {
+      console.error('Error fetching recipients:', err);
+      return res.status(500).json({ error: 'Failed to fetch recipients' });
+    }
+
+    res.json(rows.map(row => ({
+      ...row,
+      digest: !!row.digest,
+      all_podcasts: !!row.all_podcasts,
+      podcast_ids: row.podcast_ids ? row.podcast_ids.split(',').map(Number) : []
+    })));
+  });
+});
+
+// Add recipient
+app.post('/api/recipients', (req, res) => {
+  const { email, name, digest } = req.body;
+  // New recipients receive every podcast unless told otherwise
+  const allPodcasts = req.body.all_podcasts !== false;
+
+  if (!email) {
+    return res.status(400).json({ error: 'Missing required field: email' });
+  }
+
+  db.run('INSERT INTO recipients (email, name, digest, all_podcasts) VALUES (?, ?, ?, ?)',
+    [email, name || null, digest ? 1 : 0, allPodcasts ? 1 : 0], function(err) {
+    if (err) {
+      console.error('Error adding recipient:', err);
+      if (err.message.includes('UNIQUE')) {
+        return res.status(409).json({ error: 'Recipient already exists' });
+      }
+      return res.status(500).json({ error: 'Failed to add recipient' });
+    }
+
+    res.status(201).json({ id: this.lastID, email, name, digest: !!digest, all_podcasts: allPodcasts, podcast_ids: [] });
+  });
+});
+
+// Replace a recipient's subscriptions; with all_podcasts: true the list is
+// ignored and the recipient receives every podcast (an empty list means none)
+app.put('/api/recipients/:id/subscriptions', (req, res) => {
+  const { id } = req.params;
+  const allPodcasts = req.body.all_podcasts === true;
+  const podcast_ids = allPodcasts ? [] : req.body.podcast_ids;
+
+  if (!Array.isArray(podcast_ids)) {
+    return res.status(400).json({ error: 'podcast_ids must be an array' });
+  }
+
+  // Statements run in order; remember the first failure and roll back at the end
+  let began = false;
+  let found = false;
+  let failure = null;
+  const check = (err) => {
+    if (err && !failure) {
+      failure = err;
+    }
+  };
+
+  db.serialize(() => {
+    db.run('BEGIN', (err) => {
+      check(err);
+      began = !err;
+    });
+    db.run('UPDATE recipients SET all_podcasts = ? WHERE id = ?', [allPodcasts ? 1 : 0, id], function(err) {
+      check(err);
+      found = !err && this.changes > 0;
+    });
+    db.run('DELETE FROM subscriptions WHERE recipient_id = ?', [id], check);
+    const stmt = db.prepare('INSERT OR IGNORE INTO subscriptions (recipient_id, podcast_id) VALUES (?, ?)', check);
+    podcast_ids.forEach(podcastId => stmt.run(id, podcastId, check));
+    stmt.finalize((err) => {
+      check(err);
+
+      if (failure || !found) {
+        if (failure) {
+          console.error('Error updating subscriptions:', failure);
+        }
+        const respond = () => failure
+          ? res.status(500).json({ error: 'Failed to update subscriptions' })
+          : res.status(404).json({ error: 'Recipient not found' });
+        // A failed BEGIN means another transaction is open, which is not ours to roll back
+        return began ? db.run('ROLLBACK', respond) : respond();
+      }
+
+      db.run('COMMIT', (err) => {
+        if (err) {
+          console.error('Error updating subscriptions:', err);
+          db.run('ROLLBACK');
+          return res.status(500).json({ error: 'Failed to update subscriptions' });
+        }
+
+        res.json({ message: 'Subscriptions updated successfully', all_podcasts: allPodcasts, podcast_ids });
+      });
+    });
+  });
+});
+
+// Delete recipient
+app.delete('/api/recipients/:id', (req, res) => {
+  const { id } = req.params;
+
+  db.run('DELETE FROM recipients WHERE id = ?', [id], function(err) {
+    if (err) {
+      console.error('Error deleting recipient:', err);
+      return res.status(500).json({ error: 'Failed to delete recipient' });
+    }
+
+    if (this.changes === 0) {
+      return res.status(404).json({ error: 'Recipient not found' });
+    }
+
+    db.run('DELETE FROM subscriptions WHERE recipient_id = ?', [id]);
+    res.json({ message: 'Recipient deleted successfully' });
+  });
+});
+
 // ============== PROCESSED VIDEOS ROUTES ==============
 
-// Get processed videos (optionally filter by podcast)
+// Get processed videos (optionally filter by podcast, or full-text search summaries with ?q=)
 app.get('/api/processed-videos', (req, res) => {
-  const { podcast_id } = req.query;
+  const { podcast_id, q } = req.query;
+
+  if (q) {
+    const match = toMatchExpression(q);
+    if (!match) {
+      return res.json([]);
+    }
+
+    const limit = Math.min(parseInt(req.query.limit, 10) || 50, 500);
+    const params = [match];
+    let searchSql = `
+      SELECT pv.*, p.channel_name,
+             snippet(summaries_fts, -1, '[', ']', '...', 16) AS snippet,
+             bm25(summaries_fts, 10.0, 2.0, 1.0) AS score
+      FROM summaries_fts
+      JOIN summaries s ON s.id = summaries_fts.rowid
+      JOIN processed_videos pv ON pv.video_id = s.video_id
+      LEFT JOIN podcasts p ON pv.podcast_id = p.id
+      WHERE summaries_fts MATCH ?
+    `;
+
+    if (podcast_id) {
+      searchSql += ' AND pv.podcast_id = ?';
+      params.push(podcast_id);
+    }
+    searchSql += ' ORDER BY score LIMIT ?';
+    params.push(limit);
+
+    return db.all(searchSql, params, (err, rows) => {
+      if (err) {
+        console.error('Error searching summaries:', err);
+        return res.status(500).json({ error: 'Failed to search summaries' });
+      }
+      res.json(rows);
+    });
+  }
+
+  // Keyset pagination (newest first): ?limit=N, then ?cursor= from the X-Next-Cursor header
+  const limit = parseInt(req.query.limit, 10) || 0;
+  const { cursor } = req.query;
+
+  const conditions = [];
+  const params = [];
+
+  if (podcast_id) {
+    conditions.push('pv.podcast_id = ?');
+    params.push(podcast_id);
+  }
+
+  if (cursor) {
+    const separator = cursor.indexOf('|');
+    if (separator === -1) {
+      return res.status(400).json({ error: 'Invalid cursor' });
+    }
+    conditions.push('(pv.processed_at, pv.video_id) < (?, ?)');
+    params.push(cursor.slice(0, separator), cursor.slice(separator + 1));
+  }
 
   let sql = `
     SELECT pv.*, p.channel_name
     FROM processed_videos pv
     LEFT JOIN podcasts p ON pv.podcast_id = p.id
-    ORDER BY pv.processed_at DESC
+    ${conditions.length ? 'WHERE ' + conditions.join(' AND ') : ''}
+    ORDER BY pv.processed_at DESC, pv.video_id DESC
   `;
 
-  const params = [];
-
-  if (podcast_id) {
-    sql = `
-      SELECT pv.*, p.channel_name
-      FROM processed_videos pv
-      LEFT JOIN podcasts p ON pv.podcast_id = p.id
-      WHERE pv.podcast_id = ?
-      ORDER BY pv.processed_at DESC
-    `;
-    params.push(podcast_id);
+  if (limit > 0) {
+    sql += ' LIMIT ?';
+    params.push(limit);
   }
 
   db.all(sql, params, (err, rows) => {
@@ -396,6 +654,10 @@ app.get('/api/processed-videos', (req, res) => {
       console.error('Error fetching processed videos:', err);
       return res.status(500).json({ error: 'Failed to fetch processed videos' });
     }
+    if (limit > 0 && rows.length === limit) {
+      const last = rows[rows.length - 1];
+      res.set('X-Next-Cursor', `${last.processed_at}|${last.video_id}`);
+    }
     res.json(rows);
   });
 });
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Cross-source duplicate episode detection.
+Shows followed both as a YouTube channel and as an Apple Podcasts feed publish
+the same episode under different IDs. Episodes are matched on normalized title
+tokens (MinHash signatures, LSH-banded in SQLite for sub-linear lookup) plus
+publish-time proximity, before any transcript fetch or LLM call.
+"""
+
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import unicodedata
+from array import array
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+_MERSENNE = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed permutations so signatures stay comparable across runs
+_PERMS = [
+    (int.from_bytes(hashlib.blake2b(f'a{i}'.encode(), digest_size=8).digest(), 'big') % (_MERSENNE - 1) + 1,
+     int.from_bytes(hashlib.blake2b(f'b{i}'.encode(), digest_size=8).digest(), 'big') % _MERSENNE)
+    for i in range(NUM_PERM)
+]
+
+# Words that differ between a show's YouTube and RSS titles without changing the episode
+_NOISE_WORDS = {
+    'a', 'an', 'the', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'with', 'at', 'by', 'from',
+    'is', 'are', 'vs', 'ep', 'episode', 'podcast', 'full', 'video', 'audio', 'official',
+    'feat', 'ft', 'part', 'pt'
+}
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Titles with fewer informative tokens are too generic to match safely
+MIN_TOKENS = 3
+
+
+def title_tokens(title: str) -> Set[str]:
+    """Lower-case, accent-fold and tokenize a title, dropping noise words and bare numbers."""
+    folded = unicodedata.normalize('NFKD', title or '').encode('ascii', 'ignore').decode('ascii').lower()
+    return {
+        token for token in _TOKEN_RE.findall(folded)
+        if token not in _NOISE_WORDS and not (token.isdigit() and len(token) < 4)
+    }
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def minhash(tokens: Set[str]) -> array:
+    """Compute a MinHash signature over a token set."""
+    hashes = [_token_hash(token) for token in tokens]
+    signature = array('Q')
+    for a, b in _PERMS:
+        signature.append(min(((a * h + b) % _MERSENNE) & _MAX_HASH for h in hashes))
+    return signature
+
+
+def similarity(sig_a: array, sig_b: array) -> float:
+    """Estimated Jaccard similarity of the token sets behind two signatures."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def band_keys(signature: array) -> List[int]:
+    """Hash each LSH band of a signature to a signed 64-bit bucket key."""
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(chunk, digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'big', signed=True))
+    return keys
+
+
+class EpisodeIndex:
+    """Episode-identity index stored alongside processed_videos in podcasts.db."""
+
+    def __init__(self, db_path: str = 'podcasts.db', threshold: float = 0.6,
+                 window_hours: float = 72.0):
+        self.db_path = db_path
+        self.threshold = threshold
+        self.window_seconds = window_hours * 3600
+        self._conn = sqlite3.connect(db_path)
+        # Episodes claimed during this run but not yet delivered
+        self._pending: Dict[str, Dict] = {}
+        self._init_database()
+
+    def _init_database(self):
+        """Create the index tables and backfill recently processed episodes."""
+        try:
+            cursor = self._conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS episode_signatures (
+                    video_id TEXT PRIMARY KEY,
+                    podcast_id INTEGER,
+                    title TEXT,
+                    published_at REAL,
+                    signature BLOB NOT NULL
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS episode_lsh (
+                    band INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    video_id TEXT NOT NULL,
+                    PRIMARY KEY (band, bucket, video_id)
+                ) WITHOUT ROWID
+            ''')
+
+            self._conn.commit()
+            self._backfill()
+        except sqlite3.Error as e:
+            logger.error("Episode index initialization error: %s", e)
+            raise
+
+    def _backfill(self, days: int = 30):
+        """Index recent processed episodes that predate the index, using processed_at as publish time."""
+        cursor = self._conn.cursor()
+        try:
+            cursor.execute('''
+                SELECT pv.video_id, pv.podcast_id, pv.title, CAST(strftime('%s', pv.processed_at) AS REAL)
+                FROM processed_videos pv
+                LEFT JOIN episode_signatures es ON es.video_id = pv.video_id
+                WHERE es.video_id IS NULL AND pv.processed_at >= datetime('now', ?)
+            ''', (f'-{days} days',))
+        except sqlite3.OperationalError:
+            # processed_videos without podcast_id (standalone summarizer database)
+            return
+
+        rows = cursor.fetchall()
+        for video_id, podcast_id, title, published_at in rows:
+            self._insert(video_id, podcast_id, title or '', published_at)
+        if rows:
+            self._conn.commit()
+            logger.info("Indexed %s previously processed episodes for duplicate detection", len(rows))
+
+    def _insert(self, video_id: str, podcast_id: Optional[int], title: str,
+                published_at: Optional[float]) -> bool:
+        tokens = title_tokens(title)
+        if len(tokens) < MIN_TOKENS:
+            return False
+
+        signature = minhash(tokens)
+        cursor = self._conn.cursor()
+        cursor.execute(
+            'INSERT OR REPLACE INTO episode_signatures (video_id, podcast_id, title, published_at, signature) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (video_id, podcast_id, title, published_at, signature.tobytes())
+        )
+        cursor.executemany(
+            'INSERT OR IGNORE INTO episode_lsh (band, bucket, video_id) VALUES (?, ?, ?)',
+            [(band, key, video_id) for band, key in enumerate(band_keys(signature))]
+        )
+        return True
+
+    def _matches(self, podcast_id: Optional[int], published_at: Optional[float],
+                 other_podcast_id: Optional[int], other_published_at: Optional[float]) -> bool:
+        """Apply the cross-source and publish-time checks to a title match."""
+        if podcast_id is not None and podcast_id == other_podcast_id:
+            return False
+        if published_at is not None and other_published_at is not None and \
+                abs(published_at - other_published_at) > self.window_seconds:
+            return False
+        return True
+
+    def find_duplicate(self, video_id: str, title: str, podcast_id: Optional[int],
+                       published_at: Optional[float]) -> Optional[Dict]:
+        """Return the already-known episode this one duplicates, if any.
+
+        The result has 'video_id', 'podcast_id', 'title', 'score' and 'pending'
+        (True when the match was claimed earlier in this run but is not
+        delivered yet).
+        """
+        tokens = title_tokens(title)
+        if len(tokens) < MIN_TOKENS:
+            return None
+
+        signature = minhash(tokens)
+        keys = band_keys(signature)
+
+        best = None
+        try:
+            cursor = self._conn.cursor()
+            clauses = ' OR '.join(['(band = ? AND bucket = ?)'] * BANDS)
+            params = [value for band, key in enumerate(keys) for value in (band, key)]
+            cursor.execute(f'''
+                SELECT es.video_id, es.podcast_id, es.title, es.published_at, es.signature
+                FROM episode_signatures es
+                WHERE es.video_id IN (SELECT video_id FROM episode_lsh WHERE {clauses})
+                  AND es.video_id != ?
+            ''', params + [video_id])
+
+            for other_id, other_podcast, other_title, other_published, blob in cursor.fetchall():
+                if not self._matches(podcast_id, published_at, other_podcast, other_published):
+                    continue
+                score = similarity(signature, array('Q', blob))
+                if score >= self.threshold and (best is None or score > best['score']):
+                    best = {'video_id': other_id, 'podcast_id': other_podcast, 'title': other_title,
+                            'score': score, 'pending': False}
+        except sqlite3.Error as e:
+            logger.error("Episode index query error: %s", e)
+
+        for other_id, claim in self._pending.items():
+            if other_id == video_id or not self._matches(podcast_id, published_at,
+                                                         claim['podcast_id'], claim['published_at']):
+                continue
+            score = similarity(signature, claim['signature'])
+            if score >= self.threshold and (best is None or score > best['score']):
+                best = {'video_id': other_id, 'podcast_id': claim['podcast_id'], 'title': claim['title'],
+                        'score': score, 'pending': True}
+
+        return best
+
+    def claim(self, video_id: str, title: str, podcast_id: Optional[int], published_at: Optional[float]):
+        """Note an episode that is being summarized in this run."""
+        tokens = title_tokens(title)
+        if len(tokens) >= MIN_TOKENS:
+            self._pending[video_id] = {
+                'title': title,
+                'podcast_id': podcast_id,
+                'published_at': published_at,
+                'signature': minhash(tokens),
+            }
+
+    def add(self, video_id: str, title: str, podcast_id: Optional[int], published_at: Optional[float]):
+        """Persist a delivered episode in the index."""
+        self._pending.pop(video_id, None)
+        try:
+            if self._insert(video_id, podcast_id, title, published_at if published_at else time.time()):
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error("Episode index insert error: %s", e)
+
+    def clear_claims(self):
+        """Drop claims left by episodes that were not delivered this run."""
+        self._pending.clear()
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Streaming export of processed-episode history and summaries.
+Rows are read page by page (keyset pagination) and written as they arrive, so
+memory use stays constant however large the archive is. The output format
+follows the file name: `.jsonl`, `.jsonl.gz`, `.jsonl.bz2`, `.jsonl.xz`, or
+`.parquet` (requires the optional `pyarrow` package).
+"""
+
+import bz2
+import gzip
+import json
+import lzma
+import logging
+from typing import Dict, Iterable, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    # pyarrow not installed, Parquet export is unavailable
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ('video_id', 'podcast_id', 'title', 'url', 'processed_at', 'summary')
+
+_OPENERS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+
+def _write_jsonl(rows: Iterable[Dict], path: str) -> int:
+    """Write rows as JSON lines, compressed according to the file suffix."""
+    opener = next((open_ for suffix, open_ in _OPENERS.items() if path.endswith(suffix)), open)
+
+    count = 0
+    with opener(path, 'wt', encoding='utf-8') as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False))
+            f.write('\n')
+            count += 1
+    return count
+
+
+def _write_parquet(rows: Iterable[Dict], path: str, row_group_size: int) -> int:
+    """Write rows to a zstd-compressed Parquet file, one row group at a time."""
+    if pq is None:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    schema = pa.schema([
+        ('video_id', pa.string()),
+        ('podcast_id', pa.int64()),
+        ('title', pa.string()),
+        ('url', pa.string()),
+        ('processed_at', pa.string()),
+        ('summary', pa.string()),
+    ])
+
+    count = 0
+    batch = []
+    with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= row_group_size:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    return count
+
+
+def export_history(video_db, path: str, podcast_id: Optional[int] = None,
+                   page_size: int = 1000) -> int:
+    """Stream every processed episode (with its summary, if stored) to `path`.
+
+    Returns the number of rows written.
+    """
+    rows = ({field: row.get(field) for field in FIELDS}
+            for row in video_db.iter_history(page_size=page_size, podcast_id=podcast_id,
+                                             include_summaries=True))
+
+    if path.endswith('.parquet'):
+        count = _write_parquet(rows, path, page_size)
+    else:
+        count = _write_jsonl(rows, path)
+
+    logger.info("Exported %s episodes to %s", count, path)
+    return count
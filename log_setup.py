@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Non-blocking, structured logging for the summarizer.
+Records are handed to a queue on the calling thread and written by a single
+listener thread: JSON lines to a rotating log file (for latency analysis) and
+the familiar human-readable lines to stdout. Every record carries the podcast,
+video and pipeline stage it was logged under.
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+CONTEXT_FIELDS = ('podcast', 'video', 'stage')
+
+# Stage timings go to the JSON log only, not to the console
+TIMING_LOGGER = 'stage_timing'
+
+_context: contextvars.ContextVar[Dict] = contextvars.ContextVar('log_context', default={})
+_listener: Optional[logging.handlers.QueueListener] = None
+# Latest context of each thread, readable from other threads (used by the sampling profiler)
+_thread_contexts: Dict[int, Dict] = {}
+
+# Attributes every LogRecord has; anything else was passed via `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+@contextmanager
+def log_context(**fields):
+    """Attach podcast/video/stage fields to every record logged inside the block."""
+    ident = threading.get_ident()
+    context = {**_context.get(), **fields}
+    token = _context.set(context)
+    _thread_contexts[ident] = context
+    try:
+        yield
+    finally:
+        _context.reset(token)
+        _thread_contexts[ident] = _context.get()
+
+
+def bind_log_context(**fields):
+    """Add fields to the current context until the enclosing `log_context` exits."""
+    context = {**_context.get(), **fields}
+    _context.set(context)
+    _thread_contexts[threading.get_ident()] = context
+
+
+def thread_context(ident: int) -> Dict:
+    """Return the log context another thread is currently running under."""
+    return _thread_contexts.get(ident, {})
+
+
+def log_timing(name: str, elapsed_ms: float, outcome: str = 'ok'):
+    """Record a timing (JSON log only) under the current context."""
+    logging.getLogger(TIMING_LOGGER).info(
+        "%s finished in %.1f ms", name, elapsed_ms,
+        extra={'elapsed_ms': elapsed_ms, 'outcome': outcome}
+    )
+
+
+@contextmanager
+def log_stage(stage: str):
+    """Run a block as a named pipeline stage and record how long it took."""
+    started = time.monotonic()
+    outcome = 'ok'
+    with log_context(stage=stage):
+        try:
+            yield
+        except BaseException:
+            outcome = 'error'
+            raise
+        finally:
+            log_timing(stage, round((time.monotonic() - started) * 1000, 1), outcome)
+
+
+class ContextFilter(logging.Filter):
+    """Copy the current log context onto each record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _context.get()
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, context.get(field))
+        return True
+
+
+class _ExcludeLogger(logging.Filter):
+    """Drop records from one logger (and its children)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not (record.name == self.name or record.name.startswith(self.name + '.'))
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            entry[field] = getattr(record, field, None)
+
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key not in entry:
+                entry[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Render only the message on the calling thread; leave formatting to the listener."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Arguments may be mutated after the call returns, so merge them now
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _file_handler(path: str) -> logging.Handler:
+    """Rotating file handler: by time when LOG_ROTATE_WHEN is set, otherwise by size."""
+    when = os.getenv('LOG_ROTATE_WHEN', '')
+    backup_count = int(os.getenv('LOG_BACKUP_COUNT', 5))
+
+    if when:
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when=when, backupCount=backup_count, encoding='utf-8'
+        )
+
+    max_bytes = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))
+    return logging.handlers.RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+    )
+
+
+def configure_logging():
+    """Route the root logger through a background queue listener.
+
+    Settings come from the environment: LOG_LEVEL, LOG_FILE, LOG_FORMAT
+    ('json' or 'text' for the file), LOG_MAX_BYTES, LOG_BACKUP_COUNT and
+    LOG_ROTATE_WHEN. Calling it again is a no-op.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    text_format = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+    file_handler = _file_handler(os.getenv('LOG_FILE', 'summarizer.log'))
+    if os.getenv('LOG_FORMAT', 'json').lower() == 'text':
+        file_handler.setFormatter(text_format)
+        file_handler.addFilter(_ExcludeLogger(TIMING_LOGGER))
+    else:
+        file_handler.setFormatter(JsonFormatter())
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(text_format)
+    console_handler.addFilter(_ExcludeLogger(TIMING_LOGGER))
+
+    log_queue: 'queue.SimpleQueue' = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Bulk podcast import/export for RSS Whisperer.
+Reads an OPML file or a plain list of URLs, resolves YouTube channel IDs and
+Apple Podcasts feeds concurrently (Apple IDs are looked up in batches), and
+adds every podcast in one transaction. Subscriptions can be exported as OPML.
+"""
+
+import re
+import sys
+import json
+import sqlite3
+import argparse
+import http.client
+import urllib.error
+import urllib.parse
+import urllib.request
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from xml.sax.saxutils import quoteattr
+
+ITUNES_LOOKUP_URL = 'https://itunes.apple.com/lookup'
+YOUTUBE_BASE_URL = 'https://www.youtube.com'
+
+# The iTunes lookup API accepts a comma-separated list of IDs
+ITUNES_BATCH_SIZE = 100
+
+USER_AGENT = 'Mozilla/5.0 (compatible; rss-whisperer)'
+
+_CHANNEL_ID_PATTERNS = [
+    re.compile(r'"channelId":"(UC[^"]+)"'),
+    re.compile(r'"externalChannelId":"(UC[^"]+)"'),
+    re.compile(r'"browseId":"(UC[^"]+)"'),
+    re.compile(r'channel_id=(UC[^&"]+)'),
+]
+_TITLE_PATTERN = re.compile(r'<meta property="og:title" content="([^"]+)"')
+
+
+def youtube_feed_url(channel_id: str) -> str:
+    return f'https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}'
+
+
+def read_opml(path: str) -> List[Dict]:
+    """Return {'url', 'title'} for every feed outline in an OPML file."""
+    items = []
+    for _, element in ET.iterparse(path):
+        if element.tag == 'outline':
+            url = element.get('xmlUrl') or element.get('url')
+            if url:
+                items.append({'url': url.strip(), 'title': element.get('title') or element.get('text')})
+        element.clear()
+    return items
+
+
+def read_url_list(path: str) -> List[Dict]:
+    """Return {'url', 'title'} for every non-comment line of a text file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [{'url': line.strip(), 'title': None} for line in f
+                if line.strip() and not line.lstrip().startswith('#')]
+
+
+def read_subscriptions(path: str) -> List[Dict]:
+    """Read an OPML file or a URL list, detected from the content."""
+    with open(path, 'r', encoding='utf-8') as f:
+        head = f.read(512).lstrip()
+    if head.startswith('<'):
+        return read_opml(path)
+    return read_url_list(path)
+
+
+class PodcastResolver:
+    """Turn subscription URLs into podcast rows, fetching concurrently.
+
+    The lookup and YouTube base URLs can point at a local stand-in server.
+    """
+
+    def __init__(self, workers: int = 16, timeout: float = 10.0,
+                 itunes_lookup_url: str = ITUNES_LOOKUP_URL,
+                 youtube_base_url: str = YOUTUBE_BASE_URL):
+        self.workers = workers
+        self.timeout = timeout
+        self.itunes_lookup_url = itunes_lookup_url
+        self.youtube_base_url = youtube_base_url.rstrip('/')
+
+    def _get(self, url: str) -> bytes:
+        request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+    def resolve(self, items: Iterable[Dict]) -> Dict[str, List]:
+        """Return {'podcasts': [...], 'failed': [(url, reason), ...]}.
+
+        Each podcast dict has channel_id, channel_name, rss_url and source.
+        """
+        podcasts = []
+        failed = []
+        apple: Dict[str, Dict] = {}
+        youtube_pages: List[Dict] = []
+        needs_title: List[Dict] = []
+
+        for item in items:
+            url = item['url']
+            parsed = urllib.parse.urlparse(url)
+            host = parsed.netloc.lower()
+
+            if 'podcasts.apple.com' in host:
+                match = re.search(r'/id(\d+)', parsed.path)
+                if match:
+                    apple[match.group(1)] = item
+                else:
+                    failed.append((url, 'no podcast ID in Apple Podcasts URL'))
+
+            elif 'youtube.com' in host or 'youtu.be' in host:
+                channel_id = urllib.parse.parse_qs(parsed.query).get('channel_id', [None])[0]
+                if not channel_id:
+                    match = re.match(r'/channel/([^/?]+)', parsed.path)
+                    channel_id = match.group(1) if match else None
+
+                if channel_id:
+                    podcast = {'channel_id': channel_id, 'channel_name': item['title'],
+                               'rss_url': youtube_feed_url(channel_id), 'source': 'youtube'}
+                    podcasts.append(podcast)
+                    if not podcast['channel_name']:
+                        needs_title.append(podcast)
+                else:
+                    # @handle, /c/ and /user/ URLs only resolve through the channel page
+                    youtube_pages.append(item)
+
+            elif parsed.scheme in ('http', 'https'):
+                podcast = {'channel_id': None, 'channel_name': item['title'], 'rss_url': url, 'source': 'rss'}
+                podcasts.append(podcast)
+                if not podcast['channel_name']:
+                    needs_title.append(podcast)
+
+            else:
+                failed.append((url, 'unsupported URL'))
+
+        batches = [list(apple)[i:i + ITUNES_BATCH_SIZE] for i in range(0, len(apple), ITUNES_BATCH_SIZE)]
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            apple_futures = [(batch, pool.submit(self._lookup_apple, batch)) for batch in batches]
+            page_futures = [(item, pool.submit(self._resolve_youtube_page, item['url'])) for item in youtube_pages]
+            title_futures = [(podcast, pool.submit(self._feed_title, podcast['rss_url'])) for podcast in needs_title]
+
+            for batch, future in apple_futures:
+                try:
+                    found = future.result()
+                except (urllib.error.URLError, http.client.HTTPException, OSError, ValueError) as e:
+                    failed.extend((apple[podcast_id]['url'], f'iTunes lookup failed: {e}') for podcast_id in batch)
+                    continue
+                for podcast_id in batch:
+                    result = found.get(podcast_id)
+                    if result and result.get('feedUrl'):
+                        podcasts.append({
+                            'channel_id': None,
+                            'channel_name': apple[podcast_id]['title'] or result.get('collectionName')
+                            or result.get('trackName'),
+                            'rss_url': result['feedUrl'],
+                            'source': 'apple_podcasts',
+                        })
+                    else:
+                        failed.append((apple[podcast_id]['url'], 'not found or no RSS feed'))
+
+            for item, future in page_futures:
+                try:
+                    channel_id, title = future.result()
+                except (urllib.error.URLError, http.client.HTTPException, OSError, ValueError) as e:
+                    failed.append((item['url'], str(e)))
+                    continue
+                podcasts.append({'channel_id': channel_id, 'channel_name': item['title'] or title,
+                                 'rss_url': youtube_feed_url(channel_id), 'source': 'youtube'})
+
+            for podcast, future in title_futures:
+                try:
+                    podcast['channel_name'] = future.result()
+                except (urllib.error.URLError, http.client.HTTPException, OSError, ET.ParseError):
+                    pass
+
+        for podcast in podcasts:
+            podcast['channel_name'] = podcast['channel_name'] or podcast['rss_url']
+
+        return {'podcasts': podcasts, 'failed': failed}
+
+    def _lookup_apple(self, podcast_ids: List[str]) -> Dict[str, Dict]:
+        """Look up many Apple Podcasts IDs in one iTunes request."""
+        query = urllib.parse.urlencode({'id': ','.join(podcast_ids), 'entity': 'podcast'})
+        data = json.loads(self._get(f'{self.itunes_lookup_url}?{query}'))
+        return {str(result.get('collectionId')): result for result in data.get('results', [])}
+
+    def _resolve_youtube_page(self, url: str):
+        """Find the channel ID (and name) in a YouTube channel page."""
+        parsed = urllib.parse.urlparse(url)
+        page = self._get(f'{self.youtube_base_url}{parsed.path}').decode('utf-8', 'replace')
+
+        for pattern in _CHANNEL_ID_PATTERNS:
+            match = pattern.search(page)
+            if match:
+                title = _TITLE_PATTERN.search(page)
+                return match.group(1), title.group(1) if title else None
+
+        raise ValueError('could not find channel ID in page')
+
+    def _feed_title(self, rss_url: str) -> Optional[str]:
+        """Read the channel title from the start of a feed."""
+        request = urllib.request.Request(rss_url, headers={'User-Agent': USER_AGENT})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            for _, element in ET.iterparse(response):
+                if element.tag.rsplit('}', 1)[-1] == 'title':
+                    return (element.text or '').strip() or None
+        return None
+
+
+def insert_podcasts(podcasts: List[Dict], db_path: str = 'podcasts.db', frequency_days: int = 7) -> int:
+    """Insert podcasts in one transaction, skipping feeds already subscribed. Returns rows added."""
+    conn = sqlite3.connect(db_path)
+    try:
+        before = conn.total_changes
+        with conn:
+            conn.executemany(
+                'INSERT OR IGNORE INTO podcasts (channel_id, channel_name, rss_url, source, frequency_days) '
+                'VALUES (?, ?, ?, ?, ?)',
+                [(p['channel_id'], p['channel_name'], p['rss_url'], p['source'], frequency_days)
+                 for p in podcasts]
+            )
+        return conn.total_changes - before
+    finally:
+        conn.close()
+
+
+def export_opml(path: str, db_path: str = 'podcasts.db') -> int:
+    """Write all subscriptions to an OPML file. Returns the number exported."""
+    conn = sqlite3.connect(db_path)
+    count = 0
+    try:
+        cursor = conn.execute('SELECT channel_name, rss_url, channel_id FROM podcasts ORDER BY id')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n<opml version="2.0">\n')
+            f.write('  <head><title>RSS Whisperer subscriptions</title></head>\n  <body>\n')
+            for name, rss_url, channel_id in cursor:
+                attrs = f'type="rss" text={quoteattr(name or rss_url)} title={quoteattr(name or rss_url)} ' \
+                        f'xmlUrl={quoteattr(rss_url)}'
+                if channel_id:
+                    attrs += f' htmlUrl={quoteattr(f"https://www.youtube.com/channel/{channel_id}")}'
+                f.write(f'    <outline {attrs}/>\n')
+                count += 1
+            f.write('  </body>\n</opml>\n')
+    finally:
+        conn.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk import/export podcast subscriptions')
+    parser.add_argument('--db', default='podcasts.db', help='Database path (default: podcasts.db)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help='Import an OPML file or a list of URLs (one per line)')
+    import_parser.add_argument('path')
+    import_parser.add_argument('--frequency-days', type=int, default=7,
+                               help='Summary frequency for imported podcasts (default: 7)')
+    import_parser.add_argument('--workers', type=int, default=16,
+                               help='Concurrent lookups (default: 16)')
+    import_parser.add_argument('--dry-run', action='store_true', help='Resolve but do not write')
+    import_parser.add_argument('--itunes-url', default=ITUNES_LOOKUP_URL, help=argparse.SUPPRESS)
+    import_parser.add_argument('--youtube-url', default=YOUTUBE_BASE_URL, help=argparse.SUPPRESS)
+
+    export_parser = commands.add_parser('export', help='Export subscriptions as OPML')
+    export_parser.add_argument('path')
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'export':
+            count = export_opml(args.path, args.db)
+            print(f"✅ Exported {count} podcasts to {args.path}")
+            return
+
+        items = read_subscriptions(args.path)
+        print(f"Resolving {len(items)} subscriptions...")
+
+        resolver = PodcastResolver(workers=args.workers, itunes_lookup_url=args.itunes_url,
+                                   youtube_base_url=args.youtube_url)
+        result = resolver.resolve(items)
+
+        for url, reason in result['failed']:
+            print(f"❌ {url}: {reason}")
+
+        if args.dry_run:
+            for podcast in result['podcasts']:
+                print(f"  {podcast['source']:<15} {podcast['channel_name']}  {podcast['rss_url']}")
+            print(f"\nResolved {len(result['podcasts'])}, failed {len(result['failed'])} (dry run, nothing written)")
+            return
+
+        added = insert_podcasts(result['podcasts'], args.db, args.frequency_days)
+        print()
+        print("=" * 50)
+        print(f"Summary: {added} added, {len(result['podcasts']) - added} already subscribed, "
+              f"{len(result['failed'])} failed")
+
+    except (OSError, ET.ParseError, sqlite3.Error) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
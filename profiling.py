@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Profiling mode for summarizer runs.
+Wraps a run in cProfile and tracemalloc and, optionally, a wall-clock stack
+sampler whose samples are tagged with the podcast and stage each thread is
+working on. Everything lands in one output directory:
+
+    run.pstats          cProfile statistics (snakeviz, `python -m pstats`)
+    stacks.collapsed    sampled stacks for flamegraph.pl / speedscope
+    report.txt          top functions, top allocations and time per stage
+"""
+
+import os
+import sys
+import time
+import pstats
+import cProfile
+import logging
+import argparse
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Optional
+
+from log_setup import thread_context
+
+logger = logging.getLogger(__name__)
+
+TRACEMALLOC_FRAMES = 10
+
+# Leaf frames of background threads parked waiting for work; such samples
+# are dropped unless the thread is inside a tagged stage
+_IDLE_LEAVES = {
+    'threading.py:wait',
+    'threading.py:_wait_for_tstate_lock',
+    'selectors.py:select',
+    'handlers.py:dequeue',
+}
+
+
+def _frame_label(code) -> str:
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _tag(value) -> str:
+    # ';' separates frames in the collapsed format
+    return str(value).replace(';', ',')
+
+
+class StackSampler:
+    """Sample every thread's stack on an interval, tagged with its log context."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.stage_samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.reverse()
+
+                context = thread_context(ident)
+                if not context.get('stage') and stack[-1] in _IDLE_LEAVES:
+                    continue
+
+                tags = [f"{field}={_tag(context[field])}" for field in ('podcast', 'stage')
+                        if context.get(field)]
+                self.samples[';'.join([_tag(names.get(ident, ident))] + tags + stack)] += 1
+                self.stage_samples[context.get('stage') or '(no stage)'] += 1
+
+    def write_collapsed(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    """Context manager that profiles the enclosed run into `output_dir`.
+
+    `sample_interval` is in seconds; None disables the stack sampler (and
+    with it the collapsed-stack file).
+    """
+
+    def __init__(self, output_dir: str = 'profile', sample_interval: Optional[float] = 0.01,
+                 top_n: int = 25):
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.top_n = top_n
+        self._profile = cProfile.Profile()
+        self._sampler: Optional[StackSampler] = None
+        self._started = 0.0
+
+    def __enter__(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        if self.sample_interval:
+            self._sampler = StackSampler(self.sample_interval)
+            self._sampler.start()
+        self._started = time.monotonic()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._profile.disable()
+        elapsed = time.monotonic() - self._started
+        if self._sampler is not None:
+            self._sampler.stop()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self._write(elapsed, snapshot, peak)
+        return False
+
+    def _write(self, elapsed: float, snapshot: tracemalloc.Snapshot, peak: int):
+        pstats_path = os.path.join(self.output_dir, 'run.pstats')
+        report_path = os.path.join(self.output_dir, 'report.txt')
+        self._profile.dump_stats(pstats_path)
+
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ])
+
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(f"Wall time: {elapsed:.2f} s\n")
+            f.write(f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB\n")
+
+            if self._sampler is not None:
+                collapsed_path = os.path.join(self.output_dir, 'stacks.collapsed')
+                self._sampler.write_collapsed(collapsed_path)
+
+                total = sum(self._sampler.stage_samples.values()) or 1
+                f.write(f"\n== Samples by stage (busy threads, every {self.sample_interval * 1000:.0f} ms) ==\n")
+                for stage, count in self._sampler.stage_samples.most_common():
+                    f.write(f"{stage:<20} {count:>8} {100 * count / total:6.1f}%\n")
+
+            f.write(f"\n== Top {self.top_n} functions by cumulative time (main thread) ==\n")
+            stats = pstats.Stats(self._profile, stream=f)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top_n)
+
+            f.write(f"== Top {self.top_n} allocations by line (live at end of run) ==\n")
+            for stat in snapshot.statistics('lineno')[:self.top_n]:
+                f.write(f"{stat}\n")
+
+            f.write("\n== Largest allocation tracebacks ==\n")
+            for stat in snapshot.statistics('traceback')[:5]:
+                f.write(f"\n{stat.count} blocks, {stat.size / 1024:.1f} KiB\n")
+                for line in stat.traceback.format():
+                    f.write(f"{line}\n")
+
+        logger.info("Profile written to %s (report.txt, run.pstats%s)", self.output_dir,
+                    ', stacks.collapsed' if self._sampler is not None else '')
+
+
+def add_profile_args(parser: argparse.ArgumentParser):
+    """Add the --profile options shared by the command-line entry points."""
+    parser.add_argument('--profile', nargs='?', const='profile', default=None, metavar='DIR',
+                        help='Profile the run (CPU, memory, sampled stacks) into DIR (default: ./profile)')
+    parser.add_argument('--profile-interval', type=float, default=10, metavar='MS',
+                        help='Stack sampling interval in milliseconds, 0 to disable sampling (default: 10)')
+    parser.add_argument('--profile-top', type=int, default=25, metavar='N',
+                        help='Number of functions and allocation sites in the report (default: 25)')
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Timeouts, run deadlines, hedged calls and circuit breakers for external dependencies.
+"""
+
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimeout(TimeoutError):
+    """An external call did not finish within its time budget."""
+
+
+class DeadlineExceeded(StageTimeout):
+    """The run-wide deadline has passed; remaining work should be deferred."""
+
+
+class Deadline:
+    """A point in time by which the current run must finish.
+
+    `seconds=None` (or 0) means no deadline.
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.expires_at = time.monotonic() + seconds if seconds else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None when there is no deadline."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def timeout_for(self, stage_timeout: Optional[float]) -> Optional[float]:
+        """Clamp a stage timeout to the time left; raise if none is left."""
+        remaining = self.remaining()
+        if remaining is None:
+            return stage_timeout
+        if remaining <= 0:
+            raise DeadlineExceeded("Run deadline exceeded")
+        return remaining if stage_timeout is None else min(stage_timeout, remaining)
+
+
+def _start_call(func: Callable, args, kwargs, results: 'queue.Queue'):
+    """Run func on a daemon thread, posting (ok, value) to results."""
+    def target():
+        try:
+            results.put((True, func(*args, **kwargs)))
+        except BaseException as e:
+            results.put((False, e))
+
+    # Daemon threads: a call that never returns must not block interpreter exit
+    threading.Thread(target=target, daemon=True).start()
+
+
+def run_with_timeout(func: Callable, timeout: Optional[float], *args, **kwargs) -> Any:
+    """Call func, raising StageTimeout if it takes longer than `timeout` seconds.
+
+    Used for client libraries that expose no timeout of their own. The
+    abandoned call keeps running in the background until it returns.
+    """
+    if timeout is None:
+        return func(*args, **kwargs)
+
+    results: 'queue.Queue' = queue.Queue()
+    _start_call(func, args, kwargs, results)
+
+    try:
+        ok, value = results.get(timeout=timeout)
+    except queue.Empty:
+        raise StageTimeout(f"{getattr(func, '__name__', 'call')} timed out after {timeout:.1f}s")
+
+    if not ok:
+        raise value
+    return value
+
+
+def iterate_with_timeout(func: Callable[[], Iterable], timeout: Optional[float]) -> Iterator:
+    """Yield the items of func(), raising StageTimeout if they are not all in within `timeout` seconds.
+
+    The iterable is consumed on a daemon thread and its items handed over
+    through a queue, so whatever the caller does with them runs on its own
+    thread and never after it stopped iterating. Closing the generator (or
+    a timeout) makes the producer stop at its next item.
+    """
+    items: 'queue.Queue' = queue.Queue()
+    stopped = threading.Event()
+    done = object()
+
+    def produce():
+        try:
+            for item in func():
+                if stopped.is_set():
+                    return
+                items.put((True, item))
+            items.put((True, done))
+        except BaseException as e:
+            items.put((False, e))
+
+    threading.Thread(target=produce, daemon=True).start()
+    deadline = time.monotonic() + timeout if timeout is not None else None
+
+    try:
+        while True:
+            wait = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+            try:
+                ok, value = items.get(timeout=wait)
+            except queue.Empty:
+                raise StageTimeout(f"{getattr(func, '__name__', 'call')} timed out after {timeout:.1f}s")
+            if not ok:
+                raise value
+            if value is done:
+                return
+            yield value
+    finally:
+        stopped.set()
+
+
+def run_hedged(func: Callable, timeout: Optional[float], hedge_after: float, *args, **kwargs) -> Any:
+    """Call func, firing one duplicate call if the first is slower than `hedge_after`.
+
+    The first successful result wins. If both calls fail, the last error is
+    raised; if neither finishes within `timeout`, StageTimeout is raised.
+    """
+    started = time.monotonic()
+    results: 'queue.Queue' = queue.Queue()
+    _start_call(func, args, kwargs, results)
+    in_flight = 1
+    hedged = False
+    error: Optional[BaseException] = None
+
+    while in_flight:
+        elapsed = time.monotonic() - started
+        if timeout is not None and elapsed >= timeout:
+            break
+
+        if hedged:
+            wait = None if timeout is None else timeout - elapsed
+        else:
+            wait = hedge_after - elapsed
+            if timeout is not None:
+                wait = min(wait, timeout - elapsed)
+
+        try:
+            ok, value = results.get(timeout=max(wait, 0.0) if wait is not None else None)
+        except queue.Empty:
+            if not hedged and time.monotonic() - started >= hedge_after:
+                logger.info("Hedging slow call after %.1fs", hedge_after)
+                _start_call(func, args, kwargs, results)
+                in_flight += 1
+                hedged = True
+            continue
+
+        in_flight -= 1
+        if ok:
+            return value
+        error = value
+
+        # A fast failure of the only call should not wait for the hedge point
+        if not hedged:
+            raise error
+
+    if error is not None and in_flight == 0:
+        raise error
+    raise StageTimeout(f"{getattr(func, '__name__', 'call')} timed out after {timeout:.1f}s")
+
+
+class LatencyTracker:
+    """Rolling window of call latencies for percentile-based hedging."""
+
+    def __init__(self, window: int = 100, min_samples: int = 10):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Return the pct-th percentile, or None until enough samples exist."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class CircuitOpenError(Exception):
+    """A call was refused because its dependency's circuit is open."""
+
+
+class CircuitBreaker:
+    """Fail fast while an upstream dependency is down.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls are refused for `reset_timeout` seconds. It then half-opens and
+    lets a single probe through: success closes it, failure re-opens it.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def available(self) -> bool:
+        """True if a call would currently be let through (does not claim the probe)."""
+        with self._lock:
+            state = self._current_state()
+            return state == self.CLOSED or (state == self.HALF_OPEN and not self._probe_in_flight)
+
+    def allow(self) -> bool:
+        """Claim permission for one call."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def check(self):
+        """Claim permission for one call, raising CircuitOpenError if refused."""
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("%s circuit closed", self.name)
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning("%s circuit opened after %s failures", self.name, self._failures)
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
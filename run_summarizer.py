@@ -1,14 +1,22 @@
 #!/usr/bin/env python3
 """
 Enhanced RSS Whisperer - Database-Integrated Version
-Reads podcast subscriptions and email from the database populated by the frontend.
+Reads podcast subscriptions and recipients from the database populated by the frontend.
 """
 
 import os
+import re
 import sys
+import signal
+import queue
 import sqlite3
+import calendar
 import logging
-from typing import List, Dict, Optional
+import argparse
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Set, Tuple
 from datetime import datetime, timedelta
 import time
 
@@ -25,18 +33,24 @@ from summarizer import (
     GeminiSummarizer,
     EmailSender,
     VideoDatabase,
-    Config
+    Config,
+    estimate_tokens,
+    fetch_feed
 )
+from websub import WebSubSubscriber, WebSubReceiver, DEFAULT_HUB_URL
+from transcriber import LocalTranscriber, find_enclosure_url
+from text_cleaner import TextNormalizer, HTML, CAPTIONS
+from dedup import EpisodeIndex
+from history_export import export_history
+from profiling import Profiler, add_profile_args
+from scheduler import RunBudget, weighted_round_robin
+from snapshot import SnapshotError, create_snapshot, restore_snapshot
+from topics import TopicClusterer
+from resilience import Deadline, DeadlineExceeded, StageTimeout, CircuitBreaker, CircuitOpenError
+from log_setup import configure_logging, log_context, bind_log_context, log_stage, log_timing
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('summarizer.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -49,6 +63,8 @@ class DatabaseConfig:
 
     def load_from_db(self) -> Dict:
         """Load user settings from database."""
+        self.config = {}
+
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -61,40 +77,80 @@ class DatabaseConfig:
                 self.config[key] = value
 
             conn.close()
-            logger.info(f"Loaded {len(rows)} settings from database")
+            logger.info("Loaded %s settings from database", len(rows))
             return self.config
 
         except sqlite3.Error as e:
-            logger.error(f"Database error: {e}")
+            logger.error("Database error: %s", e)
             return {}
 
     def get_podcasts(self) -> List[Dict]:
         """Get all podcast subscriptions from database."""
         try:
             conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
 
-            cursor.execute('SELECT id, channel_id, channel_name, rss_url, source, frequency_days FROM podcasts')
+            cursor.execute('SELECT * FROM podcasts')
             rows = cursor.fetchall()
 
             podcasts = [
                 {
-                    'id': row[0],
-                    'channel_id': row[1],
-                    'channel_name': row[2],
-                    'rss_url': row[3],
-                    'source': row[4] if len(row) > 4 else 'youtube',
-                    'frequency_days': row[5] if len(row) > 5 else 7
+                    'id': row['id'],
+                    'channel_id': row['channel_id'],
+                    'channel_name': row['channel_name'],
+                    'rss_url': row['rss_url'],
+                    'source': row['source'] if 'source' in row.keys() else 'youtube',
+                    'frequency_days': row['frequency_days'] if 'frequency_days' in row.keys() else 7,
+                    # Share of each run relative to other podcasts (scheduling weight)
+                    'weight': row['weight'] if 'weight' in row.keys() and row['weight'] else 1
                 }
                 for row in rows
             ]
 
             conn.close()
-            logger.info(f"Found {len(podcasts)} podcast subscriptions")
+            logger.info("Found %s podcast subscriptions", len(podcasts))
             return podcasts
 
         except sqlite3.Error as e:
-            logger.error(f"Database error: {e}")
+            logger.error("Database error: %s", e)
+            return []
+
+    def get_recipients(self) -> List[Dict]:
+        """Get email recipients and the podcasts each one subscribes to.
+
+        'podcast_ids' is None for a recipient flagged to receive every
+        podcast, and otherwise the (possibly empty) set subscribed to.
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            try:
+                cursor.execute('SELECT id, email, digest, all_podcasts FROM recipients ORDER BY id')
+            except sqlite3.OperationalError:
+                # Database not migrated by the backend yet: no subscriptions meant every podcast
+                cursor.execute('''
+                    SELECT id, email, digest,
+                           NOT EXISTS (SELECT 1 FROM subscriptions s WHERE s.recipient_id = recipients.id)
+                    FROM recipients ORDER BY id
+                ''')
+            recipients = {
+                row[0]: {'email': row[1], 'digest': bool(row[2]), 'podcast_ids': None if row[3] else set()}
+                for row in cursor.fetchall()
+            }
+
+            cursor.execute('SELECT recipient_id, podcast_id FROM subscriptions')
+            for recipient_id, podcast_id in cursor.fetchall():
+                recipient = recipients.get(recipient_id)
+                if recipient is not None and recipient['podcast_ids'] is not None:
+                    recipient['podcast_ids'].add(podcast_id)
+
+            conn.close()
+            return list(recipients.values())
+
+        except sqlite3.OperationalError:
+            # Tables are created by newer backends; older databases use the email setting
             return []
 
 
@@ -122,6 +178,47 @@ class MinimalConfig:
         self.smtp_username = os.getenv('SMTP_USERNAME', config.get('smtp_username', ''))
         self.smtp_password = os.getenv('SMTP_PASSWORD', config.get('smtp_password', ''))
         self.email_from = os.getenv('EMAIL_FROM', config.get('email_from', ''))
+        self.daemon_interval_minutes = int(os.getenv('DAEMON_INTERVAL_MINUTES', config.get('daemon_interval_minutes', 60)))
+        self.websub_callback_url = os.getenv('WEBSUB_CALLBACK_URL', config.get('websub_callback_url'))
+        self.websub_hub_url = os.getenv('WEBSUB_HUB_URL', config.get('websub_hub_url', DEFAULT_HUB_URL))
+        self.websub_port = int(os.getenv('WEBSUB_PORT', config.get('websub_port', 8085)))
+        self.websub_secret = os.getenv('WEBSUB_SECRET', config.get('websub_secret'))
+        self.local_transcription = str(os.getenv('LOCAL_TRANSCRIPTION', config.get('local_transcription', ''))).lower() in ('1', 'true', 'yes')
+        self.whisper_model = os.getenv('WHISPER_MODEL', config.get('whisper_model', 'base.en'))
+        self.transcribe_workers = int(os.getenv('TRANSCRIBE_WORKERS', config.get('transcribe_workers', 0))) or None
+        # Pack short inputs into shared Gemini requests (0 disables)
+        self.batch_tokens = int(os.getenv('GEMINI_BATCH_TOKENS', config.get('gemini_batch_tokens', 0)))
+        self.batch_item_tokens = int(os.getenv('GEMINI_BATCH_ITEM_TOKENS', config.get('gemini_batch_item_tokens', 1000)))
+        # Per-stage timeouts in seconds (0 = wait forever) and a per-run deadline
+        self.feed_timeout = float(os.getenv('FEED_TIMEOUT', config.get('feed_timeout', 30)))
+        self.transcript_timeout = float(os.getenv('TRANSCRIPT_TIMEOUT', config.get('transcript_timeout', 60)))
+        self.gemini_timeout = float(os.getenv('GEMINI_TIMEOUT', config.get('gemini_timeout', 180)))
+        self.smtp_timeout = float(os.getenv('SMTP_TIMEOUT', config.get('smtp_timeout', 30)))
+        self.run_deadline_minutes = float(os.getenv('RUN_DEADLINE_MINUTES', config.get('run_deadline_minutes', 0)))
+        # Fire a duplicate Gemini request once a call exceeds this latency percentile (0 = off)
+        self.gemini_hedge_percentile = float(os.getenv('GEMINI_HEDGE_PERCENTILE', config.get('gemini_hedge_percentile', 0)))
+        # Circuit breakers: consecutive failures before opening, and seconds before a probe
+        self.breaker_failures = int(os.getenv('BREAKER_FAILURES', config.get('breaker_failures', 5)))
+        self.breaker_reset_seconds = float(os.getenv('BREAKER_RESET_SECONDS', config.get('breaker_reset_seconds', 60)))
+        # Cross-source duplicate detection (opt-in): title similarity threshold (0 disables) and publish window
+        self.dedup_threshold = float(os.getenv('DEDUP_THRESHOLD', config.get('dedup_threshold', 0)))
+        self.dedup_window_hours = float(os.getenv('DEDUP_WINDOW_HOURS', config.get('dedup_window_hours', 72)))
+        # Also full-text index transcripts alongside summaries (larger database)
+        self.search_index_transcripts = str(os.getenv('SEARCH_INDEX_TRANSCRIPTS', config.get('search_index_transcripts', ''))).lower() in ('1', 'true', 'yes')
+        # Per-run LLM budget: summarization calls and estimated input tokens (0 = unlimited)
+        self.llm_budget_calls = int(os.getenv('LLM_BUDGET_CALLS', config.get('llm_budget_calls', 0)))
+        self.llm_budget_tokens = int(os.getenv('LLM_BUDGET_TOKENS', config.get('llm_budget_tokens', 0)))
+        # Recipients per SMTP transaction when one summary goes to many people
+        self.smtp_max_recipients = int(os.getenv('SMTP_MAX_RECIPIENTS', config.get('smtp_max_recipients', 50)))
+        # Stream Gemini output to the terminal and a spool file as it is generated
+        self.gemini_stream = str(os.getenv('GEMINI_STREAM', config.get('gemini_stream', ''))).lower() in ('1', 'true', 'yes')
+        self.spool_dir = os.getenv('SPOOL_DIR', config.get('spool_dir', 'spool'))
+        # Minimum similarity for digest summaries to share a topic group (0 disables, needs numpy)
+        self.topic_threshold = float(os.getenv('TOPIC_THRESHOLD', config.get('topic_threshold', 0.3)))
+        # Concurrent transcript downloads in --prefetch mode
+        self.prefetch_workers = int(os.getenv('PREFETCH_WORKERS', config.get('prefetch_workers', 8)))
+        # -1 means one worker per CPU core, 0 normalizes inline
+        self.normalize_workers = int(os.getenv('NORMALIZE_WORKERS', config.get('normalize_workers', -1)))
 
         # Validate only the essential keys
         if not self.gemini_api_key:
@@ -134,28 +231,41 @@ class MinimalConfig:
 class IntegratedSummarizer:
     """Main orchestrator that integrates with the web app database."""
 
-    def __init__(self):
+    def __init__(self, daemon: bool = False):
         # Load configuration (only requires API key, not email)
         self.base_config = MinimalConfig()
         self.db_config = DatabaseConfig()
-        self.db_config.load_from_db()
-
-        # Get email from database (falls back to config file)
-        self.email_to = self.db_config.config.get('email') or self.base_config.get('email_to')
-
-        if not self.email_to:
-            raise ValueError("No email configured. Please set email in the web interface.")
-
-        # Get podcasts from database
-        self.podcasts = self.db_config.get_podcasts()
-
-        if not self.podcasts:
-            logger.warning("No podcasts configured. Please add podcasts in the web interface.")
+        self.daemon = daemon
+        self._stop_event = threading.Event()
+        # Set by enable_websub(); podcasts with a live push subscription skip polling
+        self.websub: Optional[WebSubSubscriber] = None
+        self._websub_receiver: Optional[WebSubReceiver] = None
+
+        self.reload()
+
+        self.stage_timeouts = {
+            stage: self.base_config.get(f'{stage}_timeout') or None
+            for stage in ('feed', 'transcript', 'gemini', 'smtp')
+        }
+        self.deadline = Deadline()
+        self.budget = RunBudget()
+
+        # One breaker per upstream so an outage fails fast instead of timing out per episode
+        self.breakers = {
+            name: CircuitBreaker(
+                name,
+                failure_threshold=self.base_config.get('breaker_failures', 5),
+                reset_timeout=self.base_config.get('breaker_reset_seconds', 60)
+            )
+            for name in ('transcript', 'gemini', 'smtp')
+        }
 
         # Initialize components
         self.summarizer = GeminiSummarizer(
             self.base_config.get('gemini_api_key'),
-            self.base_config.get('gemini_model', 'gemini-2.5-flash')
+            self.base_config.get('gemini_model', 'gemini-2.5-flash'),
+            hedge_percentile=self.base_config.get('gemini_hedge_percentile') or None,
+            breaker=self.breakers['gemini']
         )
 
         self.email_sender = EmailSender(
@@ -163,80 +273,445 @@ class IntegratedSummarizer:
             self.base_config.get('smtp_port'),
             self.base_config.get('smtp_username'),
             self.base_config.get('smtp_password'),
-            self.base_config.get('email_from')
+            self.base_config.get('email_from'),
+            keep_alive=daemon,
+            timeout=self.stage_timeouts['smtp'],
+            breaker=self.breakers['smtp'],
+            max_recipients=self.base_config.get('smtp_max_recipients', 50)
         )
 
         # Use shared database for processed videos
-        self.video_db = VideoDatabase('podcasts.db')
+        self.video_db = VideoDatabase('podcasts.db', persistent=daemon)
+
+        # Transcripts served from the cache vs. downloaded during this run
+        self.transcript_stats = {'cached': 0, 'fetched': 0}
+
+        # Related summaries are grouped under a topic heading in digests (needs numpy)
+        self.topics = None
+        if self.base_config.get('topic_threshold'):
+            if TopicClusterer.is_available():
+                self.topics = TopicClusterer('podcasts.db', threshold=self.base_config.get('topic_threshold'))
+            else:
+                logger.debug("numpy is not installed, digests are not grouped by topic")
+
+        # Same episode published on several sources is summarized once
+        self.episode_index = None
+        if self.base_config.get('dedup_threshold'):
+            self.episode_index = EpisodeIndex(
+                'podcasts.db',
+                threshold=self.base_config.get('dedup_threshold'),
+                window_hours=self.base_config.get('dedup_window_hours', 72)
+            )
+
+        # Short inputs waiting for a packed summarization request
+        self.batch_tokens = self.base_config.get('batch_tokens', 0)
+        self.batch_item_tokens = self.base_config.get('batch_item_tokens', 1000)
+        self._pending_batch: List[Dict] = []
+
+        # CPU-bound text cleanup runs in its own process pool
+        normalize_workers = self.base_config.get('normalize_workers', -1)
+        self.normalizer = TextNormalizer(workers=None if normalize_workers < 0 else normalize_workers)
+
+        # Optional local speech-to-text for episodes without a YouTube transcript
+        self.local_transcriber = None
+        if self.base_config.get('local_transcription'):
+            if LocalTranscriber.is_available():
+                self.local_transcriber = LocalTranscriber(
+                    self.base_config.get('whisper_model', 'base.en'),
+                    workers=self.base_config.get('transcribe_workers')
+                )
+            else:
+                logger.warning("LOCAL_TRANSCRIPTION is set but faster-whisper/ffmpeg is not installed")
+
+    def reload(self):
+        """(Re)load recipients and podcast subscriptions edited through the web UI."""
+        self.db_config.load_from_db()
+
+        self.recipients = self.db_config.get_recipients()
+
+        if not self.recipients:
+            # Single-user setup: the email setting (or config file) receives every podcast
+            email_to = self.db_config.config.get('email') or self.base_config.get('email_to')
+
+            if not email_to:
+                raise ValueError("No email configured. Please set email in the web interface.")
+
+            self.recipients = [{'email': email_to, 'digest': False, 'podcast_ids': None}]
+
+        # Get podcasts from database
+        self.podcasts = self.db_config.get_podcasts()
+
+        if not self.podcasts:
+            logger.warning("No podcasts configured. Please add podcasts in the web interface.")
+
+        # Who gets each podcast: (immediate addresses, digest addresses)
+        self.audience: Dict[int, Tuple[List[str], List[str]]] = {}
+        for podcast in self.podcasts:
+            immediate, digest = [], []
+            for recipient in self.recipients:
+                if recipient['podcast_ids'] is None or podcast['id'] in recipient['podcast_ids']:
+                    (digest if recipient['digest'] else immediate).append(recipient['email'])
+            self.audience[podcast['id']] = (immediate, digest)
+
+    def _timeout(self, stage: str) -> Optional[float]:
+        """Timeout for a stage, clamped to the run deadline."""
+        return self.deadline.timeout_for(self.stage_timeouts[stage])
+
+    def _smtp_timeout(self) -> Optional[float]:
+        """SMTP timeout; summaries are already paid for, so they go out even past the deadline."""
+        try:
+            return self._timeout('smtp')
+        except DeadlineExceeded:
+            return self.stage_timeouts['smtp']
+
+    def _has_audience(self, podcast: Dict) -> bool:
+        return any(self.audience.get(podcast['id'], ((), ())))
+
+    def request_stop(self):
+        """Ask a running loop to stop after the current podcast."""
+        self._stop_event.set()
+
+    def close(self):
+        """Release warm connections held in daemon mode."""
+        if self._websub_receiver is not None:
+            self._websub_receiver.stop()
+        if self.local_transcriber is not None:
+            self.local_transcriber.close()
+        self.normalizer.close()
+        if self.episode_index is not None:
+            self.episode_index.close()
+        if self.topics is not None:
+            self.topics.close()
+        self.email_sender.close()
+        self.video_db.close()
+
+    def enable_websub(self, callback_url: str, port: int):
+        """Start the push receiver; YouTube podcasts are subscribed on each reload."""
+        self.websub = WebSubSubscriber(
+            callback_url,
+            hub_url=self.base_config.get('websub_hub_url', DEFAULT_HUB_URL),
+            secret=self.base_config.get('websub_secret')
+        )
+        self._websub_receiver = WebSubReceiver(self.websub, port=port)
+        self._websub_receiver.start()
+
+    def process_pushed(self, timeout: float) -> int:
+        """Process entries pushed by the hub, waiting up to `timeout` seconds for the first."""
+        if self._websub_receiver is None:
+            self._stop_event.wait(timeout)
+            return 0
 
-    def process_all_podcasts(self):
-        """Process all podcast subscriptions from the database."""
+        processed = 0
+        try:
+            podcast, entry = self._websub_receiver.queue.get(timeout=timeout)
+        except queue.Empty:
+            return 0
+
+        # Pushed entries get the stage timeouts but no run-wide deadline or budget
+        self.deadline = Deadline()
+        self.budget = RunBudget()
+
+        with self.email_sender.session():
+            while True:
+                # Pushed entries are latency-sensitive, so they are never packed
+                if not self._has_audience(podcast):
+                    logger.debug("No recipients subscribed to %s, ignoring pushed entry", podcast['channel_name'])
+                elif self._process_entry(podcast, entry, allow_batch=False) == 'processed':
+                    processed += 1
+                if self._stop_event.is_set():
+                    break
+                try:
+                    podcast, entry = self._websub_receiver.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            self.flush_digests()
+
+        if self.episode_index is not None:
+            self.episode_index.clear_claims()
+
+        return processed
+
+    def process_all_podcasts(self, skip_pushed: bool = False):
+        """Process all podcast subscriptions from the database.
+
+        With `skip_pushed`, podcasts that have a verified WebSub lease are left
+        to the push receiver instead of being polled.
+        """
         logger.info("=" * 60)
-        logger.info(f"Processing {len(self.podcasts)} podcast subscriptions")
-        logger.info(f"Email recipient: {self.email_to}")
+        logger.info("Processing %s podcast subscriptions", len(self.podcasts))
+        logger.info("Email recipients: %s", ', '.join(recipient['email'] for recipient in self.recipients))
         logger.info("=" * 60)
 
+        deadline_minutes = self.base_config.get('run_deadline_minutes', 0)
+        self.deadline = Deadline(deadline_minutes * 60 if deadline_minutes else None)
+        self.budget = RunBudget(
+            self.base_config.get('llm_budget_calls') or None,
+            self.base_config.get('llm_budget_tokens') or None
+        )
+
         total_processed = 0
         total_errors = 0
+        total_deferred = 0
+        self.transcript_stats = {'cached': 0, 'fetched': 0}
+
+        # Gather every podcast's candidate episodes first, then interleave them
+        queues: Dict[int, List[Tuple[object, Optional[str]]]] = {}
+        podcasts_by_id: Dict[int, Dict] = {}
 
         for podcast in self.podcasts:
-            logger.info(f"\nProcessing: {podcast['channel_name']}")
+            if self._stop_event.is_set():
+                logger.info("Stop requested, leaving remaining podcasts for the next run")
+                break
 
-            try:
-                result = self._process_podcast(podcast)
-                total_processed += result['processed']
-                total_errors += result['errors']
+            if self.deadline.expired():
+                logger.warning("Run deadline reached, leaving remaining podcasts for the next run")
+                break
+
+            if skip_pushed and self.websub is not None and self.websub.is_active(podcast['rss_url']):
+                logger.debug("Skipping poll for push-subscribed podcast: %s", podcast['channel_name'])
+                continue
 
+            # Nobody would receive the summaries, so don't pay for them
+            if not self._has_audience(podcast):
+                logger.debug("No recipients subscribed to %s, skipping", podcast['channel_name'])
+                continue
+
+            logger.info("\nChecking: %s", podcast['channel_name'])
+
+            try:
+                with log_context(podcast=podcast['channel_name']):
+                    candidates = self._collect_entries(podcast)
             except Exception as e:
-                logger.error(f"Error processing podcast '{podcast['channel_name']}': {e}")
+                logger.error("Error processing podcast '%s': %s", podcast['channel_name'], e)
+                total_errors += 1
+                continue
+
+            if candidates is None:
                 total_errors += 1
+            elif candidates:
+                queues[podcast['id']] = candidates
+                podcasts_by_id[podcast['id']] = podcast
+
+        weights = {podcast_id: podcast.get('weight') or 1 for podcast_id, podcast in podcasts_by_id.items()}
+        remaining = sum(len(entries) for entries in queues.values())
+        logger.info("Scheduling %s new episodes across %s podcasts", remaining, len(queues))
+
+        # One SMTP session for every email of the run
+        with self.email_sender.session():
+            for podcast_id, (entry, show_notes) in weighted_round_robin(queues, weights):
+                if self._stop_event.is_set():
+                    logger.info("Stop requested, deferring %s remaining episodes to the next run", remaining)
+                    total_deferred += remaining
+                    break
+
+                if self.deadline.expired():
+                    logger.warning("Run deadline reached, deferring %s remaining episodes", remaining)
+                    total_deferred += remaining
+                    break
+
+                if self.budget.exhausted():
+                    logger.info("Deferring %s remaining episodes to the next run", remaining)
+                    total_deferred += remaining
+                    break
+
+                remaining -= 1
+
+                outcome = self._process_entry(podcasts_by_id[podcast_id], entry, show_notes)
+                if outcome == 'processed':
+                    total_processed += 1
+                elif outcome == 'error':
+                    total_errors += 1
+                elif outcome == 'deferred':
+                    total_deferred += 1
+
+            result = self.flush_batch()
+            total_processed += result['processed']
+            total_errors += result['errors']
+            total_deferred += result.get('deferred', 0)
+
+            self.flush_digests()
+
+        if self.episode_index is not None:
+            self.episode_index.clear_claims()
 
         logger.info("=" * 60)
-        logger.info(f"Summary: Processed {total_processed} videos, {total_errors} errors")
+        logger.info("Summary: Processed %s videos, %s errors, %s deferred", total_processed, total_errors, total_deferred)
+        logger.info("Transcripts: %s from cache, %s fetched during the run",
+                    self.transcript_stats['cached'], self.transcript_stats['fetched'])
         logger.info("=" * 60)
 
-    def _is_podcast_new(self, podcast_id: int) -> bool:
-        """Check if this podcast has any processed videos yet."""
-        try:
-            conn = sqlite3.connect('podcasts.db')
-            cursor = conn.cursor()
+    def run_forever(self, interval_minutes: int):
+        """Poll all podcasts every `interval_minutes` until stopped."""
+        logger.info("Daemon mode: polling every %s minutes", interval_minutes)
 
-            cursor.execute(
-                'SELECT COUNT(*) FROM processed_videos WHERE podcast_id = ?',
-                (podcast_id,)
-            )
+        # The first cycle polls everything so nothing published while we were
+        # down is missed; later cycles leave push-subscribed podcasts to WebSub
+        first_cycle = True
 
-            count = cursor.fetchone()[0]
-            conn.close()
+        while not self._stop_event.is_set():
+            try:
+                self.reload()
+                if self.websub is not None:
+                    self.websub.sync(self.podcasts)
+                self.process_all_podcasts(skip_pushed=not first_cycle)
+            except ValueError as e:
+                logger.error("Configuration error: %s", e)
+            except Exception as e:
+                logger.error("Error during polling cycle: %s", e)
+
+            first_cycle = False
+            next_poll = time.monotonic() + interval_minutes * 60
+
+            # Between polls, handle pushed entries as they arrive
+            while not self._stop_event.is_set():
+                remaining = next_poll - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    self.process_pushed(min(remaining, 1.0))
+                except Exception as e:
+                    logger.error("Error processing pushed entries: %s", e)
+
+        logger.info("Daemon stopped")
+
+    def prefetch_transcripts(self) -> Dict:
+        """Download and cache the transcripts of new episodes ahead of a run.
+
+        Feeds are polled exactly as a run would poll them, and every missing
+        YouTube transcript (and local speech-to-text, when enabled) is put in
+        the transcript cache, so the scheduled run finds them warm and only
+        summarizes and delivers. Unavailable transcripts go to the negative
+        cache with the usual retry backoff. Returns readiness counts.
+        """
+        started = time.monotonic()
 
-            return count == 0
+        # video ID -> (podcast, entry); an episode listed by two podcasts is fetched once
+        pending: Dict[str, Tuple[Dict, object]] = {}
+        for podcast in self.podcasts:
+            if self._stop_event.is_set():
+                break
+            if not self._has_audience(podcast):
+                continue
+            # Show notes are summarized as they are; only downloaded transcripts are worth warming
+            if podcast.get('source', 'youtube') != 'youtube' and self.local_transcriber is None:
+                continue
+
+            with log_context(podcast=podcast['channel_name']):
+                candidates = self._collect_entries(podcast)
+            for entry, _ in candidates or []:
+                video_id = self._entry_id(podcast, entry)
+                if video_id:
+                    pending.setdefault(video_id, (podcast, entry))
+
+        stats = {'episodes': len(pending), 'cached': 0, 'fetched': 0, 'unavailable': 0, 'waiting': 0}
+        cached = self.video_db.cached_transcript_ids(list(pending))
+        youtube: List[str] = []
+        audio: List[Tuple[str, object]] = []
+
+        for video_id, (podcast, entry) in pending.items():
+            if video_id in cached:
+                stats['cached'] += 1
+                continue
+            retry_at = self.video_db.transcript_retry_at(video_id)
+            if retry_at is not None and retry_at > time.time():
+                stats['waiting'] += 1
+            elif podcast.get('source', 'youtube') == 'youtube':
+                youtube.append(video_id)
+            else:
+                audio.append((video_id, entry))
+
+        timeout = self._timeout('transcript')
+
+        def fetch(video_id: str) -> Tuple[Optional[List[str]], Optional[str]]:
+            if self._stop_event.is_set():
+                return None, None
+            with log_context(video=video_id):
+                try:
+                    return TranscriptExtractor.fetch_transcript_segments(
+                        video_id, timeout, self.breakers['transcript']
+                    )
+                except StageTimeout:
+                    return None, 'transient'
+                except CircuitOpenError:
+                    # The run retries these once the service recovers
+                    return None, None
+
+        # Downloads are I/O-bound and run concurrently; the database is only touched here
+        fetched: List[Tuple[str, List[str]]] = []
+        if youtube:
+            workers = max(1, min(self.base_config.get('prefetch_workers', 8), len(youtube)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prefetch') as pool:
+                futures = {pool.submit(fetch, video_id): video_id for video_id in youtube}
+                for future in as_completed(futures):
+                    segments, reason = future.result()
+                    if segments:
+                        fetched.append((futures[future], segments))
+                    elif reason:
+                        self.video_db.record_transcript_failure(futures[future], reason)
+                        stats['unavailable'] += 1
+
+        # Caption cleanup for the whole batch in one pass over the process pool
+        texts = self.normalizer.clean_many([(CAPTIONS, segments) for _, segments in fetched])
+        for (video_id, _), text in zip(fetched, texts):
+            if text:
+                self.video_db.cache_transcript(video_id, text, 'youtube')
+                self.video_db.clear_transcript_failure(video_id)
+                stats['fetched'] += 1
+
+        # Local transcription already spreads each episode over every core
+        for video_id, entry in audio:
+            if self._stop_event.is_set():
+                break
+            audio_url = find_enclosure_url(entry)
+            if not audio_url:
+                continue
+            with log_context(video=video_id):
+                result = self.local_transcriber.transcribe_url(audio_url)
+            if result and result['transcript']:
+                self.video_db.cache_transcript(video_id, result['transcript'], 'local-stt')
+                stats['fetched'] += 1
+
+        stats['ready'] = stats['cached'] + stats['fetched']
+        elapsed = time.monotonic() - started
+        log_timing('prefetch', elapsed * 1000)
+        logger.info("Prefetch: %s of %s new episodes ready (%s fetched now, %s already cached), "
+                    "%s unavailable, %s waiting for a retry, in %.1fs",
+                    stats['ready'], stats['episodes'], stats['fetched'], stats['cached'],
+                    stats['unavailable'], stats['waiting'], elapsed)
+        return stats
+
+    def _is_podcast_new(self, podcast_id: int) -> bool:
+        """Check if this podcast has any processed videos yet."""
+        try:
+            return self.video_db.count_processed(podcast_id) == 0
 
         except sqlite3.Error as e:
-            logger.error(f"Database error checking podcast status: {e}")
+            logger.error("Database error checking podcast status: %s", e)
             return False
 
-    def _process_podcast(self, podcast: Dict) -> Dict:
-        """Process a single podcast's RSS feed."""
-        import feedparser
-
-        processed_count = 0
-        error_count = 0
+    def _collect_entries(self, podcast: Dict) -> Optional[List[Tuple[object, Optional[str]]]]:
+        """Fetch a podcast's feed and return its candidate (entry, show notes) pairs.
 
+        Candidates are ordered newest first so that, when the run budget runs
+        out, older backlog is what waits. Returns None if the feed is unusable.
+        """
         try:
             # Parse RSS feed
-            feed = feedparser.parse(podcast['rss_url'])
+            with log_stage('feed'):
+                feed = fetch_feed(podcast['rss_url'], self._timeout('feed'))
 
             if feed.bozo:
-                logger.error(f"Error parsing RSS feed: {feed.bozo_exception}")
-                return {'processed': 0, 'errors': 1}
+                logger.error("Error parsing RSS feed: %s", feed.bozo_exception)
+                return None
 
-            logger.info(f"Found {len(feed.entries)} entries")
+            logger.info("Found %s entries", len(feed.entries))
 
             # Check if this is a newly added podcast
             is_new_podcast = self._is_podcast_new(podcast['id'])
 
             if is_new_podcast and len(feed.entries) > 0:
-                logger.info(f"🎉 New podcast detected! Will process latest episode as welcome summary")
+                logger.info("🎉 New podcast detected! Will process latest episode as welcome summary")
 
                 # For YouTube, skip Shorts; for others, just use first entry
                 if podcast.get('source') == 'youtube':
@@ -247,7 +722,7 @@ class IntegratedSummarizer:
                         # Skip YouTube Shorts (they usually don't have transcripts)
                         if '/shorts/' not in video_url:
                             entries_to_process = [entry]
-                            logger.info(f"Found first full YouTube video (skipping Shorts)")
+                            logger.info("Found first full YouTube video (skipping Shorts)")
                             break
 
                     # If all entries are Shorts, just try the first one anyway
@@ -257,7 +732,7 @@ class IntegratedSummarizer:
                 else:
                     # For non-YouTube podcasts, just use the first episode
                     entries_to_process = [feed.entries[0]]
-                    logger.info(f"Using latest episode for new podcast")
+                    logger.info("Using latest episode for new podcast")
             else:
                 # Process all entries for existing podcasts (checks for new ones)
                 entries_to_process = feed.entries
@@ -279,127 +754,597 @@ class IntegratedSummarizer:
                 if published_date is None or published_date >= cutoff_date:
                     filtered_entries.append(entry)
                 else:
-                    logger.debug(f"Skipping old episode (published {published_date.strftime('%Y-%m-%d')}): {entry.get('title', 'Unknown')}")
+                    logger.debug("Skipping old episode (published %s): %s", published_date.strftime('%Y-%m-%d'), entry.get('title', 'Unknown'))
 
             entries_to_process = filtered_entries
-            logger.info(f"After date filtering ({frequency_days} days): {len(entries_to_process)} episodes to process")
+            logger.info("After date filtering (%s days): %s episodes to process", frequency_days, len(entries_to_process))
 
-            # Process each entry
+            # Already-processed episodes would only waste scheduling turns
+            new_entries = []
             for entry in entries_to_process:
-                try:
-                    video_title = entry.get('title', 'Unknown Title')
-                    video_url = entry.get('link', '')
-                    podcast_source = podcast.get('source', 'youtube')
-
-                    # Handle different podcast sources
-                    if podcast_source == 'youtube':
-                        # Extract video ID for YouTube
-                        video_id = TranscriptExtractor.extract_video_id(video_url)
-
-                        if not video_id and hasattr(entry, 'yt_videoid'):
-                            video_id = entry.yt_videoid
-
-                        if not video_id:
-                            logger.warning(f"Could not extract video ID from: {video_url}")
-                            error_count += 1
-                            continue
-                    else:
-                        # For Apple Podcasts and others, use the episode URL as ID
-                        video_id = entry.get('id', video_url)
-
-                    # Check if already processed
-                    if self.video_db.is_processed(video_id):
-                        logger.info(f"Skipping already processed: {video_title}")
-                        continue
-
-                    logger.info(f"New episode: {video_title} ({video_id[:50]}...)")
-
-                    # Extract transcript/content based on source
-                    if podcast_source == 'youtube':
-                        transcript = TranscriptExtractor.get_transcript(video_id)
-                    else:
-                        # For Apple Podcasts, use the episode description/summary
-                        transcript = entry.get('summary', '')
-                        if not transcript and hasattr(entry, 'content'):
-                            transcript = entry.content[0].value if entry.content else ''
-
-                    if not transcript:
-                        logger.warning(f"No transcript/content available: {video_title}")
-                        # Mark as processed to avoid repeated attempts
-                        self.video_db.mark_processed(video_id, video_title, video_url, podcast['id'])
-                        error_count += 1
-                        continue
-
-                    # Generate summary
-                    summary = self.summarizer.generate_summary(transcript, video_title)
-
-                    if not summary:
-                        logger.warning(f"Failed to generate summary: {video_title}")
-                        error_count += 1
-                        continue
-
-                    # Print summary to terminal
-                    print("\n" + "="*80)
-                    print(f"📝 SUMMARY: {video_title}")
-                    print("="*80)
-                    print(f"🔗 URL: {video_url}")
-                    print(f"📺 Podcast: {podcast['channel_name']}")
-                    print("-"*80)
-                    print(summary)
-                    print("="*80 + "\n")
-
-                    # Send email
-                    email_sent = self.email_sender.send_summary(
-                        self.email_to,
-                        video_title,
-                        video_url,
-                        summary
+                video_id = self._entry_id(podcast, entry)
+                if video_id and self.video_db.is_processed(video_id):
+                    logger.debug("Skipping already processed: %s", entry.get('title', 'Unknown Title'))
+                else:
+                    new_entries.append(entry)
+            entries_to_process = new_entries
+
+            # Clean all show notes of the feed in one parallel batch up front
+            show_notes = {}
+            if podcast.get('source', 'youtube') != 'youtube' and entries_to_process:
+                cleaned = self.normalizer.clean_many(
+                    [(HTML, self._raw_show_notes(entry)) for entry in entries_to_process]
+                )
+                show_notes = {id(entry): text for entry, text in zip(entries_to_process, cleaned)}
+
+            # Newest first; entries without a date keep their feed order at the end
+            entries_to_process.sort(key=lambda entry: self._published_timestamp(entry) or float('-inf'),
+                                    reverse=True)
+            return [(entry, show_notes.get(id(entry))) for entry in entries_to_process]
+
+        except Exception as e:
+            logger.error("Error processing podcast feed: %s", e)
+            return None
+
+    def _get_transcript(self, podcast_source: str, video_id: str, entry,
+                        show_notes: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+        """Return (text to summarize, failure reason), using the transcript cache when possible.
+
+        `show_notes` is the already-normalized episode description, when the
+        caller cleaned a whole feed's worth in one batch. The failure reason
+        is set only when a YouTube transcript could not be fetched.
+        """
+        cached = self.video_db.get_cached_transcript(video_id)
+        if cached:
+            logger.info("Using cached transcript for %s", video_id[:50])
+            self.transcript_stats['cached'] += 1
+            return cached, None
+
+        # Extract transcript/content based on source
+        if podcast_source == 'youtube':
+            self.transcript_stats['fetched'] += 1
+            timeout = self._timeout('transcript')
+            try:
+                segments, reason = TranscriptExtractor.fetch_transcript_segments(
+                    video_id, timeout, self.breakers['transcript']
+                )
+            except StageTimeout:
+                return None, 'transient'
+
+            if not segments:
+                return None, reason
+            transcript = self.normalizer.clean(CAPTIONS, segments)
+            if transcript:
+                self.video_db.cache_transcript(video_id, transcript, 'youtube')
+                self.video_db.clear_transcript_failure(video_id)
+            return transcript, None
+
+        if self.local_transcriber is not None:
+            audio_url = find_enclosure_url(entry)
+            if audio_url:
+                self.transcript_stats['fetched'] += 1
+                result = self.local_transcriber.transcribe_url(audio_url)
+                if result and result['transcript']:
+                    self.video_db.cache_transcript(video_id, result['transcript'], 'local-stt')
+                    return result['transcript'], None
+
+        if show_notes is not None:
+            return show_notes, None
+        return self.normalizer.clean(HTML, self._raw_show_notes(entry)), None
+
+    @staticmethod
+    def _published_timestamp(entry) -> Optional[float]:
+        """Return the entry's publish time as epoch seconds, if the feed gives one."""
+        parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+        return float(calendar.timegm(parsed)) if parsed else None
+
+    @staticmethod
+    def _raw_show_notes(entry) -> str:
+        """Return the episode description/summary HTML of a feed entry."""
+        # For Apple Podcasts, use the episode description/summary
+        transcript = entry.get('summary', '')
+        if not transcript and hasattr(entry, 'content'):
+            transcript = entry.content[0].value if entry.content else ''
+        return transcript
+
+    @staticmethod
+    def _entry_id(podcast: Dict, entry) -> Optional[str]:
+        """Return the ID an entry is tracked under in processed_videos."""
+        video_url = entry.get('link', '')
+
+        # Handle different podcast sources
+        if podcast.get('source', 'youtube') == 'youtube':
+            # Extract video ID for YouTube
+            video_id = TranscriptExtractor.extract_video_id(video_url)
+
+            if not video_id and hasattr(entry, 'yt_videoid'):
+                video_id = entry.yt_videoid
+
+            return video_id
+
+        # For Apple Podcasts and others, use the episode URL as ID
+        return entry.get('id', video_url)
+
+    def _process_entry(self, podcast: Dict, entry, show_notes: Optional[str] = None,
+                       allow_batch: bool = True) -> str:
+        """Summarize and deliver one feed entry.
+
+        Returns 'processed', 'skipped', 'error', 'deferred' when an upstream
+        is unavailable (left for a later run), or 'queued' when a short input
+        is waiting for a packed request (see `flush_batch`).
+        """
+        video_title = entry.get('title', 'Unknown Title')
+
+        try:
+            with log_context(podcast=podcast['channel_name'], video=None):
+                episode = self._prepare_entry(podcast, entry, show_notes)
+                if isinstance(episode, str):
+                    return episode
+
+                # The transcript is cached, so a deferred episode costs nothing to resume
+                tokens = estimate_tokens(episode['transcript'])
+                if not self.budget.can_afford(tokens):
+                    logger.info("Deferring '%s': ~%s tokens exceed what is left of the run's LLM budget",
+                                video_title, tokens)
+                    return 'deferred'
+
+                if allow_batch and self.batch_tokens and tokens <= self.batch_item_tokens:
+                    # Reserve the input tokens now; calls are charged per request by flush_batch
+                    self.budget.charge(tokens, calls=0)
+                    self._pending_batch.append(episode)
+                    return 'queued'
+
+                self.budget.charge(tokens)
+
+                if self.base_config.get('gemini_stream'):
+                    return self._summarize_streamed(episode)
+
+                # Generate summary
+                with log_stage('summarize'):
+                    summary = self.summarizer.generate_summary(
+                        episode['transcript'], video_title, timeout=self._timeout('gemini')
                     )
+                return self._deliver(episode, summary)
 
-                    if not email_sent:
-                        logger.warning(f"Email failed, but summary generated (see above)")
+        except (CircuitOpenError, DeadlineExceeded) as e:
+            logger.warning("Deferring '%s': %s", video_title, e)
+            return 'deferred'
 
-                    # Mark as processed (even if email failed, since we have the summary)
-                    self.video_db.mark_processed(video_id, video_title, video_url, podcast['id'])
-                    processed_count += 1
+        except Exception as e:
+            logger.error("Error processing entry '%s': %s", video_title, e)
+            return 'error'
+
+    def _prepare_entry(self, podcast: Dict, entry, show_notes: Optional[str] = None):
+        """Resolve the ID and transcript of an entry.
+
+        Returns an episode dict ready for summarization, or an outcome string
+        ('skipped' / 'error') when there is nothing to summarize.
+        """
+        video_title = entry.get('title', 'Unknown Title')
+        video_url = entry.get('link', '')
+        podcast_source = podcast.get('source', 'youtube')
+
+        video_id = self._entry_id(podcast, entry)
+        if not video_id:
+            logger.warning("Could not extract video ID from: %s", video_url)
+            return 'error'
+
+        bind_log_context(video=video_id)
+
+        # Check if already processed
+        if self.video_db.is_processed(video_id):
+            logger.info("Skipping already processed: %s", video_title)
+            return 'skipped'
+
+        # Transcript known to be unavailable and not yet due for another try
+        retry_at = self.video_db.transcript_retry_at(video_id)
+        if retry_at is not None and retry_at > time.time():
+            logger.debug("Transcript retry not due until %s: %s", datetime.fromtimestamp(retry_at).strftime('%Y-%m-%d %H:%M'), video_title)
+            return 'skipped'
+
+        logger.info("New episode: %s (%s...)", video_title, video_id[:50])
+
+        published_at = self._published_timestamp(entry)
+
+        # Same episode already summarized from another source (e.g. YouTube and Apple)
+        if self.episode_index is not None:
+            duplicate = self.episode_index.find_duplicate(video_id, video_title, podcast['id'], published_at)
+            if duplicate and duplicate['pending']:
+                logger.info("Deferring possible duplicate of '%s' in progress this run", duplicate['title'])
+                return 'deferred'
+            if duplicate and self._forward_duplicate(podcast, duplicate, video_id, video_title, video_url):
+                logger.info("Skipping cross-source duplicate of '%s' (similarity %.2f)", duplicate['title'], duplicate['score'])
+                self.video_db.mark_processed(video_id, video_title, video_url, podcast['id'])
+                return 'skipped'
+
+        # Nothing downstream can succeed while the LLM or SMTP circuit is open
+        for name in ('gemini', 'smtp'):
+            if not self.breakers[name].available():
+                logger.warning("Deferring '%s': %s circuit is open", video_title, name)
+                return 'deferred'
+
+        if self.episode_index is not None:
+            self.episode_index.claim(video_id, video_title, podcast['id'], published_at)
+
+        with log_stage('transcript'):
+            transcript, failure_reason = self._get_transcript(podcast_source, video_id, entry, show_notes)
+
+        if not transcript and failure_reason:
+            retry_at = self.video_db.record_transcript_failure(video_id, failure_reason)
+            if retry_at is not None:
+                logger.info("No transcript yet (%s), will retry after %s: %s", failure_reason, datetime.fromtimestamp(retry_at).strftime('%Y-%m-%d %H:%M'), video_title)
+                return 'deferred'
+            logger.warning("Giving up on transcript after repeated %s: %s", failure_reason, video_title)
+
+        if not transcript:
+            logger.warning("No transcript/content available: %s", video_title)
+            # Mark as processed to avoid repeated attempts
+            self.video_db.mark_processed(video_id, video_title, video_url, podcast['id'])
+            return 'error'
+
+        return {
+            'podcast': podcast,
+            'video_id': video_id,
+            'title': video_title,
+            'url': video_url,
+            'published_at': published_at,
+            'transcript': transcript,
+        }
+
+    def _forward_duplicate(self, podcast: Dict, duplicate: Dict, video_id: str,
+                           video_title: str, video_url: str) -> bool:
+        """Send the stored summary of a duplicate's original to recipients it did not reach.
+
+        Returns False when some of this podcast's recipients did not get the
+        original and its summary is not stored, so the episode must be
+        summarized after all.
+        """
+        immediate, digest = self.audience.get(podcast['id'], ([], []))
+        original_immediate, original_digest = self.audience.get(duplicate['podcast_id'], ([], []))
+        reached = set(original_immediate) | set(original_digest)
+        immediate = [address for address in immediate if address not in reached]
+        digest = [address for address in digest if address not in reached]
+        if not immediate and not digest:
+            return True
+
+        summary = self.video_db.get_summary(duplicate['video_id'])
+        if not summary:
+            logger.info("Summarizing '%s' anyway: the original's summary is not stored", video_title)
+            return False
 
-                    logger.info(f"✓ Successfully processed: {video_title}")
+        logger.info("Forwarding the summary of '%s' to %s recipients of %s",
+                    duplicate['title'], len(immediate) + len(digest), podcast['channel_name'])
+        if immediate:
+            with log_stage('deliver'):
+                if not self.email_sender.send_summary(immediate, video_title, video_url, summary,
+                                                      timeout=self._smtp_timeout()):
+                    logger.warning("Email failed for duplicate '%s'", video_title)
+        if digest:
+            self.video_db.queue_digest(digest, {
+                'video_id': video_id,
+                'podcast': podcast['channel_name'],
+                'title': video_title,
+                'url': video_url,
+                'summary': summary,
+            })
+        return True
+
+    @staticmethod
+    def _print_header(episode: Dict):
+        print("\n" + "="*80)
+        print(f"📝 SUMMARY: {episode['title']}")
+        print("="*80)
+        print(f"🔗 URL: {episode['url']}")
+        print(f"📺 Podcast: {episode['podcast']['channel_name']}")
+        print("-"*80)
+
+    def _summarize_streamed(self, episode: Dict) -> str:
+        """Summarize with a streamed response, shown on the terminal and in a spool file as it arrives.
+
+        The spool file is removed once the summary is delivered; one left
+        behind holds the partial output of a failed generation.
+        """
+        spool_dir = self.base_config.get('spool_dir', 'spool')
+        os.makedirs(spool_dir, exist_ok=True)
+        spool_path = os.path.join(spool_dir, re.sub(r'[^A-Za-z0-9._-]', '_', episode['video_id'])[:120] + '.md')
+        immediate, _ = self.audience.get(episode['podcast']['id'], ([], []))
+        started = []
+
+        self._print_header(episode)
+        with open(spool_path, 'w', encoding='utf-8') as spool:
+            def on_chunk(text: str):
+                if not started:
+                    started.append(True)
+                    # The model is answering: get the SMTP session ready while it writes
+                    if immediate:
+                        self.email_sender.warm_up(self._smtp_timeout())
+                sys.stdout.write(text)
+                sys.stdout.flush()
+                spool.write(text)
+                spool.flush()
+
+            with log_stage('summarize'):
+                summary = self.summarizer.generate_summary(
+                    episode['transcript'], episode['title'], timeout=self._timeout('gemini'), on_chunk=on_chunk
+                )
+        print("\n" + "=" * 80 + "\n")
+
+        outcome = self._deliver(episode, summary, printed=True)
+        if outcome == 'processed':
+            os.remove(spool_path)
+        return outcome
+
+    def _deliver(self, episode: Dict, summary: Optional[str], printed: bool = False) -> str:
+        """Print (unless already streamed), email and record a generated summary."""
+        video_title = episode['title']
+        video_url = episode['url']
+        podcast = episode['podcast']
+
+        if not summary:
+            logger.warning("Failed to generate summary: %s", video_title)
+            return 'error'
+
+        # Print summary to terminal
+        if not printed:
+            self._print_header(episode)
+            print(summary)
+            print("="*80 + "\n")
+
+        immediate, digest = self.audience.get(podcast['id'], ([], []))
+
+        # One message to every immediate recipient; digest recipients get it at the end of the run
+        email_sent = True
+        if immediate:
+            with log_stage('deliver'):
+                email_sent = self.email_sender.send_summary(
+                    immediate,
+                    video_title,
+                    video_url,
+                    summary,
+                    timeout=self._smtp_timeout()
+                )
+
+        # Queued in the database before the episode counts as processed, so a crash can't lose it
+        if digest:
+            self.video_db.queue_digest(digest, {
+                'video_id': episode['video_id'],
+                'podcast': podcast['channel_name'],
+                'title': video_title,
+                'url': video_url,
+                'summary': summary,
+            })
+
+        if not email_sent:
+            logger.warning("Email failed, but summary generated (see above)")
+
+        # Mark as processed (even if email failed, since we have the summary)
+        self.video_db.mark_processed(episode['video_id'], video_title, video_url, podcast['id'])
+        self.video_db.save_summary(
+            episode['video_id'], video_title, video_url, summary, podcast['id'],
+            transcript=episode['transcript'] if self.base_config.get('search_index_transcripts') else None
+        )
+        if self.topics is not None:
+            self.topics.add(episode['video_id'], summary)
+
+        if self.episode_index is not None:
+            self.episode_index.add(episode['video_id'], video_title, podcast['id'], episode['published_at'])
+
+        logger.info("✓ Successfully processed: %s", video_title)
+        return 'processed'
+
+    def flush_batch(self) -> Dict:
+        """Summarize all deferred short inputs with packed requests and deliver them."""
+        pending, self._pending_batch = self._pending_batch, []
+        if not pending:
+            return {'processed': 0, 'errors': 0}
+
+        if not self.breakers['gemini'].available():
+            logger.warning("Gemini circuit is open, deferring %s packed episodes", len(pending))
+            return {'processed': 0, 'errors': 0, 'deferred': len(pending)}
+
+        # Input tokens were charged on queueing, so only a fallback request
+        # re-sending an episode costs its tokens again; every request costs a call
+        sent: Set[int] = set()
+
+        def charge_request(indexes: List[int]) -> bool:
+            resent = sum(estimate_tokens(pending[index]['transcript']) for index in indexes if index in sent)
+            if not self.budget.can_afford(resent):
+                return False
+            sent.update(indexes)
+            self.budget.charge(resent)
+            return True
+
+        logger.info("Summarizing %s short episodes in packed requests", len(pending))
+        with log_stage('summarize'):
+            # Each request gets what is left of the run deadline; summaries
+            # generated before the deadline or an open circuit are still delivered
+            summaries, deferred = self.summarizer.generate_summaries_batch(
+                [(episode['transcript'], episode['title']) for episode in pending],
+                max_tokens=self.batch_tokens,
+                timeout=lambda: self._timeout('gemini'),
+                on_request=charge_request
+            )
 
-                except Exception as e:
-                    logger.error(f"Error processing entry '{video_title}': {e}")
-                    error_count += 1
+        processed_count = 0
+        error_count = 0
+        for index, (episode, summary) in enumerate(zip(pending, summaries)):
+            if index in deferred:
+                continue
 
-        except Exception as e:
-            logger.error(f"Error processing podcast feed: {e}")
-            error_count += 1
+            try:
+                with log_context(podcast=episode['podcast']['channel_name'], video=episode['video_id']):
+                    outcome = self._deliver(episode, summary)
+            except Exception as e:
+                logger.error("Error processing entry '%s': %s", episode['title'], e)
+                outcome = 'error'
 
-        return {'processed': processed_count, 'errors': error_count}
+            if outcome == 'processed':
+                processed_count += 1
+            else:
+                error_count += 1
+
+        return {'processed': processed_count, 'errors': error_count, 'deferred': len(deferred)}
+
+    def flush_digests(self) -> int:
+        """Email each digest recipient the summaries queued for them. Returns digests sent.
+
+        Items stay queued until their digest was sent, so a failed send (or a
+        run that never got here) is retried by the next run.
+        """
+        digest_recipients = {recipient['email'] for recipient in self.recipients if recipient['digest']}
+        sent = 0
+
+        for address, items in self.video_db.pending_digests().items():
+            last_id = items[-1]['id']
+            if address not in digest_recipients:
+                logger.info("Dropping %s queued digest summaries for %s, no longer a digest recipient",
+                            len(items), address)
+                self.video_db.clear_digest(address, last_id)
+                continue
+
+            if self.topics is not None and len(items) > 1:
+                items = [dict(item, topic=label) for label, group in self.topics.group(items) for item in group]
+
+            with log_stage('deliver'):
+                if self.email_sender.send_digest(address, items, timeout=self._smtp_timeout()):
+                    self.video_db.clear_digest(address, last_id)
+                    sent += 1
+                else:
+                    logger.warning("Digest to %s failed; its %s summaries stay queued for the next run",
+                                   address, len(items))
+
+        return sent
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description='RSS Whisperer - database-integrated summarizer')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Stay resident and poll podcasts on an interval')
+    parser.add_argument('--interval', type=int, default=None,
+                        help='Minutes between polls in daemon mode (default: DAEMON_INTERVAL_MINUTES or 60)')
+    parser.add_argument('--websub-callback', default=None,
+                        help='Public callback URL for WebSub push of YouTube feeds (daemon mode; default: WEBSUB_CALLBACK_URL)')
+    parser.add_argument('--websub-port', type=int, default=None,
+                        help='Local port for the WebSub callback server (default: WEBSUB_PORT or 8085)')
+    parser.add_argument('--prefetch', action='store_true',
+                        help='Download and cache transcripts of new episodes, then exit (run shortly before a scheduled run)')
+    parser.add_argument('--search', metavar='QUERY', default=None,
+                        help='Search stored summaries and exit')
+    parser.add_argument('--limit', type=int, default=20,
+                        help='Maximum number of search results (default: 20)')
+    parser.add_argument('--export', metavar='PATH', default=None,
+                        help='Export processed episodes and summaries to PATH (.jsonl[.gz|.bz2|.xz] or .parquet) and exit')
+    parser.add_argument('--podcast-id', type=int, default=None,
+                        help='Limit --export to one podcast')
+    parser.add_argument('--restore', metavar='PATH', default=None,
+                        help='Restore the database and caches from a snapshot before running (skipped if PATH is missing)')
+    parser.add_argument('--snapshot', metavar='PATH', default=None,
+                        help='Write a compacted snapshot of the database and caches to PATH after the run (.zst, .xz or .gz)')
+    add_profile_args(parser)
+    return parser.parse_args(argv)
+
+
+def search(query: str, limit: int):
+    """Print stored summaries matching a full-text query."""
+    video_db = VideoDatabase('podcasts.db')
+    results = video_db.search_summaries(query, limit=limit)
+
+    if not results:
+        print(f"No summaries match '{query}'")
+        return
+
+    for result in results:
+        print(f"{result['created_at']}  {result['title']}")
+        print(f"    {result['url']}")
+        print(f"    {result['snippet']}")
 
 
 def main():
     """Main entry point."""
+    args = parse_args()
+
     try:
         logger.info("Starting Integrated RSS Whisperer")
 
+        # Ephemeral runners start from the previous run's snapshot
+        if args.restore:
+            if os.path.exists(args.restore):
+                try:
+                    restore_snapshot(args.restore, 'podcasts.db')
+                except SnapshotError as e:
+                    logger.error("%s; continuing with the existing database", e)
+            else:
+                logger.info("No snapshot at %s, starting cold", args.restore)
+
         # Check if database exists
         if not os.path.exists('podcasts.db'):
             logger.error("Database not found! Please start the web application first.")
             logger.error("The backend server will create the database automatically.")
             sys.exit(1)
 
-        # Initialize and run
-        summarizer = IntegratedSummarizer()
-        summarizer.process_all_podcasts()
+        if args.search is not None:
+            search(args.search, args.limit)
+            return
+
+        if args.export is not None:
+            export_history(VideoDatabase('podcasts.db'), args.export, podcast_id=args.podcast_id)
+            return
+
+        profiler = nullcontext()
+        if args.profile:
+            profiler = Profiler(args.profile, args.profile_interval / 1000 or None, args.profile_top)
+
+        with profiler:
+            # Initialize and run
+            summarizer = IntegratedSummarizer(daemon=args.daemon)
+
+            if args.prefetch:
+                try:
+                    summarizer.prefetch_transcripts()
+                finally:
+                    summarizer.close()
+            elif args.daemon:
+                def _handle_signal(signum, frame):
+                    logger.info("Received signal %s, shutting down after current podcast", signum)
+                    summarizer.request_stop()
+
+                signal.signal(signal.SIGTERM, _handle_signal)
+                signal.signal(signal.SIGINT, _handle_signal)
+
+                callback_url = args.websub_callback or summarizer.base_config.get('websub_callback_url')
+                if callback_url:
+                    summarizer.enable_websub(
+                        callback_url,
+                        args.websub_port or summarizer.base_config.get('websub_port', 8085)
+                    )
+
+                interval = args.interval or summarizer.base_config.get('daemon_interval_minutes', 60)
+                try:
+                    summarizer.run_forever(interval)
+                finally:
+                    summarizer.close()
+            else:
+                try:
+                    summarizer.process_all_podcasts()
+                finally:
+                    summarizer.close()
+
+        if args.snapshot:
+            try:
+                create_snapshot('podcasts.db', args.snapshot)
+            except (SnapshotError, OSError, sqlite3.Error) as e:
+                logger.error("Snapshot failed: %s", e)
 
         logger.info("Integrated RSS Whisperer completed successfully")
 
     except ValueError as e:
-        logger.error(f"Configuration error: {e}")
+        logger.error("Configuration error: %s", e)
         logger.error("Please configure your email and podcasts in the web interface.")
         sys.exit(1)
 
     except Exception as e:
-        logger.error(f"Fatal error: {e}")
+        logger.error("Fatal error: %s", e)
         sys.exit(1)
 
 
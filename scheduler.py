@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Fair scheduling of episodes across podcasts and a per-run LLM budget.
+Episodes are interleaved by smooth weighted round-robin so one podcast with a
+large backlog cannot monopolize a run, and the budget caps LLM calls and input
+tokens; whatever does not fit is left unprocessed for the next run.
+"""
+
+import logging
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+def weighted_round_robin(queues: Dict[Hashable, List[T]],
+                         weights: Dict[Hashable, float]) -> Iterator[Tuple[Hashable, T]]:
+    """Yield (key, item) pairs interleaving the queues in proportion to their weights.
+
+    Smooth weighted round-robin: a queue with weight 2 is served twice as
+    often as one with weight 1, spread evenly rather than in bursts. Each
+    queue is consumed in order; exhausted queues drop out.
+    """
+    positions = {key: 0 for key, items in queues.items() if items}
+    current = {key: 0.0 for key in positions}
+
+    while positions:
+        total = 0.0
+        for key in positions:
+            weight = weights.get(key, 1.0)
+            current[key] += weight
+            total += weight
+
+        key = max(positions, key=lambda k: current[k])
+        current[key] -= total
+
+        yield key, queues[key][positions[key]]
+
+        positions[key] += 1
+        if positions[key] >= len(queues[key]):
+            del positions[key]
+            del current[key]
+
+
+class RunBudget:
+    """Cap on LLM calls and estimated input tokens for one run (None = unlimited).
+
+    A single episode larger than the whole token budget is still allowed as
+    the first call of a run, so it is not deferred forever.
+    """
+
+    def __init__(self, max_calls: Optional[int] = None, max_tokens: Optional[int] = None):
+        self.max_calls = max_calls
+        self.max_tokens = max_tokens
+        self.calls = 0
+        self.tokens = 0
+
+    def exhausted(self) -> Optional[str]:
+        """Return which limit ('calls' or 'tokens') is used up, or None."""
+        if self.max_calls is not None and self.calls >= self.max_calls:
+            return 'calls'
+        if self.max_tokens is not None and self.tokens >= self.max_tokens:
+            return 'tokens'
+        return None
+
+    def can_afford(self, tokens: int) -> bool:
+        """Check whether one more call with `tokens` input tokens fits."""
+        if self.exhausted():
+            return False
+        if self.max_tokens is not None and self.calls and self.tokens + tokens > self.max_tokens:
+            return False
+        return True
+
+    def charge(self, tokens: int, calls: int = 1):
+        """Record a call against the budget."""
+        self.calls += calls
+        self.tokens += tokens
+
+        reason = self.exhausted()
+        if reason:
+            logger.warning("LLM %s budget for this run used up (%s calls, ~%s tokens); "
+                           "remaining episodes are left for the next run", reason, self.calls, self.tokens)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Compact snapshot and restore of podcasts.db for ephemeral runners.
+The database holds every cache the summarizer keeps (transcripts, transcript
+failures, summaries and their search index, duplicate-detection signatures,
+topic vectors), so one file carries a warm start to the next machine. A
+snapshot is a `VACUUM INTO` copy with stale cache rows pruned, compressed with
+zstd (requires the optional `zstandard` package) or, by file suffix, xz or gzip.
+The header records the size and SHA-256 of the database, which restore checks
+along with SQLite's own integrity check before replacing anything.
+"""
+
+import os
+import gzip
+import lzma
+import time
+import sqlite3
+import hashlib
+import logging
+from typing import BinaryIO, Dict, Optional
+
+try:
+    import zstandard
+except ImportError:
+    # zstandard not installed, only .xz / .gz snapshots are available
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'rss-whisperer-snapshot'
+VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+
+# Raised by the decompressors on truncated or damaged input
+_DECOMPRESSION_ERRORS = (EOFError, lzma.LZMAError) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+
+class SnapshotError(Exception):
+    """A snapshot could not be written or failed verification."""
+
+
+def _codec_for(path: str) -> str:
+    if path.endswith('.xz'):
+        return 'xz'
+    if path.endswith('.gz'):
+        return 'gzip'
+    return 'zstd'
+
+
+def _compressor(codec: str, f: BinaryIO, level: Optional[int]) -> BinaryIO:
+    if codec == 'xz':
+        return lzma.open(f, 'wb', preset=3 if level is None else level)
+    if codec == 'gzip':
+        return gzip.open(f, 'wb', compresslevel=6 if level is None else level)
+    if zstandard is None:
+        raise SnapshotError("zstd snapshots require zstandard (pip install zstandard), or use a .xz path")
+    return zstandard.ZstdCompressor(level=10 if level is None else level, write_checksum=True,
+                                    threads=-1).stream_writer(f, closefd=False)
+
+
+def _decompressor(codec: str, f: BinaryIO) -> BinaryIO:
+    if codec == 'xz':
+        return lzma.open(f, 'rb')
+    if codec == 'gzip':
+        return gzip.open(f, 'rb')
+    if codec == 'zstd':
+        if zstandard is None:
+            raise SnapshotError("This snapshot is zstd-compressed; install zstandard to restore it")
+        return zstandard.ZstdDecompressor().stream_reader(f, closefd=False)
+    raise SnapshotError(f"Unknown snapshot codec: {codec}")
+
+
+def _prune(conn: sqlite3.Connection, transcript_days: float, signature_days: float) -> Dict[str, int]:
+    """Drop cache rows a later run can never hit. Returns rows deleted per cache."""
+    transcript_cutoff = f'-{transcript_days} days'
+    signature_cutoff = time.time() - signature_days * 86400
+
+    statements = [
+        # Transcripts are only reread for episodes that were not delivered yet
+        ('transcripts', '''
+            DELETE FROM transcripts
+            WHERE fetched_at < datetime('now', ?)
+              AND video_id IN (SELECT video_id FROM processed_videos)
+        ''', (transcript_cutoff,)),
+        # Duplicates only match within the publish window; the index backfills 30 days itself
+        ('episode_signatures', 'DELETE FROM episode_signatures WHERE published_at < ?', (signature_cutoff,)),
+        ('episode_lsh', '''
+            DELETE FROM episode_lsh
+            WHERE video_id NOT IN (SELECT video_id FROM episode_signatures)
+        ''', ()),
+    ]
+
+    deleted = {}
+    for name, sql, params in statements:
+        try:
+            deleted[name] = conn.execute(sql, params).rowcount
+        except sqlite3.OperationalError:
+            # Cache table not created in this database
+            continue
+    conn.commit()
+
+    try:
+        # Merge the full-text index segments into one b-tree
+        conn.execute("INSERT INTO summaries_fts(summaries_fts) VALUES ('optimize')")
+        conn.commit()
+    except sqlite3.OperationalError:
+        pass
+
+    return deleted
+
+
+def create_snapshot(db_path: str, path: str, transcript_days: float = 14,
+                    signature_days: float = 30, level: Optional[int] = None) -> Dict:
+    """Write a compacted, compressed, checksummed copy of the database to `path`.
+
+    The live database is only read (`VACUUM INTO` takes a consistent copy),
+    and `path` is replaced atomically. Returns size and pruning statistics.
+    """
+    started = time.monotonic()
+    codec = _codec_for(path)
+    copy_path = f'{path}.db.tmp'
+    out_path = f'{path}.tmp'
+
+    for leftover in (copy_path, out_path):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute('VACUUM INTO ?', (copy_path,))
+        finally:
+            conn.close()
+
+        conn = sqlite3.connect(copy_path)
+        try:
+            deleted = _prune(conn, transcript_days, signature_days)
+            if any(deleted.values()):
+                conn.execute('VACUUM')
+        finally:
+            conn.close()
+
+        digest = hashlib.sha256()
+        size = os.path.getsize(copy_path)
+        with open(copy_path, 'rb') as src:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+
+        with open(out_path, 'wb') as out:
+            out.write(b'%s %d %s %d %s\n' % (MAGIC, VERSION, codec.encode(), size, digest.hexdigest().encode()))
+            with open(copy_path, 'rb') as src, _compressor(codec, out, level) as writer:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                    writer.write(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+
+        os.replace(out_path, path)
+    finally:
+        for leftover in (copy_path, out_path):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+    stats = {
+        'database_bytes': os.path.getsize(db_path),
+        'compacted_bytes': size,
+        'snapshot_bytes': os.path.getsize(path),
+        'pruned': deleted,
+        'seconds': round(time.monotonic() - started, 2),
+    }
+    logger.info("Snapshot written to %s: %s -> %s bytes (%s compacted) in %ss, pruned %s",
+                path, stats['database_bytes'], stats['snapshot_bytes'], stats['compacted_bytes'],
+                stats['seconds'], deleted)
+    return stats
+
+
+def restore_snapshot(path: str, db_path: str) -> Dict:
+    """Replace `db_path` with the database in a snapshot, after verifying it.
+
+    The snapshot is decompressed next to the database, checked against the
+    recorded size and SHA-256 and with `PRAGMA quick_check`, and only then
+    moved into place. On any failure the existing database is left untouched.
+    """
+    started = time.monotonic()
+    tmp_path = f'{db_path}.restore'
+
+    try:
+        with open(path, 'rb') as f:
+            header = f.readline().split()
+            if len(header) != 5 or header[0] != MAGIC:
+                raise SnapshotError(f"{path} is not a snapshot")
+            if int(header[1]) > VERSION:
+                raise SnapshotError(f"Snapshot version {int(header[1])} is newer than this summarizer supports")
+            codec = header[2].decode()
+            expected_size = int(header[3])
+            expected_digest = header[4].decode()
+
+            digest = hashlib.sha256()
+            size = 0
+            with _decompressor(codec, f) as reader, open(tmp_path, 'wb') as out:
+                for chunk in iter(lambda: reader.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    out.write(chunk)
+
+        if size != expected_size or digest.hexdigest() != expected_digest:
+            raise SnapshotError(f"Snapshot {path} is corrupt (checksum mismatch)")
+
+        conn = sqlite3.connect(tmp_path)
+        try:
+            result = conn.execute('PRAGMA quick_check').fetchone()[0]
+        finally:
+            conn.close()
+        if result != 'ok':
+            raise SnapshotError(f"Snapshot {path} failed the SQLite integrity check: {result}")
+
+        # A journal left by the old database would be replayed onto the new one
+        for suffix in ('-wal', '-shm', '-journal'):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+        os.replace(tmp_path, db_path)
+
+    except _DECOMPRESSION_ERRORS as e:
+        raise SnapshotError(f"Snapshot {path} is corrupt: {e}") from e
+    except (OSError, ValueError, sqlite3.Error) as e:
+        raise SnapshotError(f"Could not restore {path}: {e}") from e
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    stats = {'database_bytes': size, 'seconds': round(time.monotonic() - started, 2)}
+    logger.info("Restored %s from %s (%s bytes) in %ss", db_path, path, size, stats['seconds'])
+    return stats
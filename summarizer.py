@@ -9,8 +9,11 @@ import sys
 import json
 import sqlite3
 import logging
+import argparse
+import threading
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 from pathlib import Path
 
 # Try to load .env file if python-dotenv is available
@@ -26,18 +29,27 @@ from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import NoTranscriptFound, TranscriptsDisabled
 import google.generativeai as genai
 import smtplib
+import time
+import math
+import urllib.request
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('summarizer.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
+from resilience import (
+    StageTimeout,
+    LatencyTracker,
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    iterate_with_timeout,
+    run_with_timeout,
+    run_hedged
 )
+from log_setup import configure_logging, log_timing
+from profiling import Profiler, add_profile_args
+
+# Configure logging
+configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -58,9 +70,9 @@ class Config:
             try:
                 with open(self.config_path, 'r') as f:
                     config = json.load(f)
-                logger.info(f"Loaded configuration from {self.config_path}")
+                logger.info("Loaded configuration from %s", self.config_path)
             except json.JSONDecodeError as e:
-                logger.error(f"Error parsing config file: {e}")
+                logger.error("Error parsing config file: %s", e)
                 raise
 
         # Override with environment variables (they take precedence)
@@ -104,17 +116,53 @@ class Config:
         return self.config.get(key, default)
 
 
+# Failure reason -> (first retry delay, longest retry delay, attempts before giving up).
+# Fresh uploads often get auto-captions within the hour; disabled transcripts
+# rarely come back, so they are retried far less.
+TRANSCRIPT_RETRY_POLICY = {
+    'NoTranscriptFound': (3600, 24 * 3600, 6),
+    'TranscriptsDisabled': (24 * 3600, 7 * 24 * 3600, 3),
+    'transient': (600, 6 * 3600, 8),
+}
+
+
 class VideoDatabase:
     """SQLite database for tracking processed videos."""
 
-    def __init__(self, db_path: str = 'processed_videos.db'):
+    def __init__(self, db_path: str = 'processed_videos.db', persistent: bool = False):
         self.db_path = db_path
+        # Long-running processes keep one connection open and remember
+        # processed IDs in memory instead of reconnecting on every lookup
+        self.persistent = persistent
+        self._conn: Optional[sqlite3.Connection] = None
+        self._processed_ids: set = set()
         self._init_database()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Return a connection, reusing the open one in persistent mode."""
+        if not self.persistent:
+            return sqlite3.connect(self.db_path)
+
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path)
+        return self._conn
+
+    def _release(self, conn: sqlite3.Connection):
+        """Close a connection unless it is the shared persistent one."""
+        if conn is not self._conn:
+            conn.close()
+
+    def close(self):
+        """Close the persistent connection, if any."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._processed_ids.clear()
+
     def _init_database(self):
         """Initialize the SQLite database and create tables if needed."""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
 
             cursor.execute('''
@@ -126,17 +174,118 @@ class VideoDatabase:
                 )
             ''')
 
+            # Keyset pagination over history walks these indexes instead of sorting
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_processed_videos_history
+                ON processed_videos (processed_at, video_id)
+            ''')
+            try:
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_processed_videos_podcast_history
+                    ON processed_videos (podcast_id, processed_at, video_id)
+                ''')
+            except sqlite3.OperationalError:
+                # processed_videos without podcast_id (standalone summarizer database)
+                pass
+
+            # Transcripts are cached so a retry or re-run never refetches them
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    video_id TEXT PRIMARY KEY,
+                    source TEXT,
+                    transcript TEXT NOT NULL,
+                    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            # Negative cache: episodes whose transcript was unavailable, and when to retry
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS transcript_failures (
+                    video_id TEXT PRIMARY KEY,
+                    reason TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 1,
+                    next_attempt_at REAL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            # Summaries waiting for a recipient's digest email, kept until it is sent
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS digest_queue (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    recipient TEXT NOT NULL,
+                    video_id TEXT NOT NULL,
+                    podcast TEXT,
+                    title TEXT,
+                    url TEXT,
+                    summary TEXT NOT NULL,
+                    queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE (recipient, video_id)
+                )
+            ''')
+
+            # Generated summaries, full-text indexed for search (transcripts only when opted in)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS summaries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    video_id TEXT NOT NULL UNIQUE,
+                    podcast_id INTEGER,
+                    title TEXT,
+                    url TEXT,
+                    summary TEXT NOT NULL,
+                    transcript TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            self._init_search_index(cursor)
+
             conn.commit()
-            conn.close()
-            logger.info(f"Database initialized at {self.db_path}")
+            self._release(conn)
+            logger.info("Database initialized at %s", self.db_path)
         except sqlite3.Error as e:
-            logger.error(f"Database initialization error: {e}")
+            logger.error("Database initialization error: %s", e)
             raise
 
+    @staticmethod
+    def _init_search_index(cursor: sqlite3.Cursor):
+        """Create the FTS5 index over summaries and the triggers that keep it in sync."""
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS summaries_fts USING fts5(
+                    title, summary, transcript,
+                    content='summaries', content_rowid='id',
+                    tokenize='porter unicode61'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5: summaries are stored but not searchable
+            logger.warning("Full-text search unavailable: %s", e)
+            return
+
+        cursor.executescript('''
+            CREATE TRIGGER IF NOT EXISTS summaries_ai AFTER INSERT ON summaries BEGIN
+                INSERT INTO summaries_fts (rowid, title, summary, transcript)
+                VALUES (new.id, new.title, new.summary, new.transcript);
+            END;
+            CREATE TRIGGER IF NOT EXISTS summaries_ad AFTER DELETE ON summaries BEGIN
+                INSERT INTO summaries_fts (summaries_fts, rowid, title, summary, transcript)
+                VALUES ('delete', old.id, old.title, old.summary, old.transcript);
+            END;
+            CREATE TRIGGER IF NOT EXISTS summaries_au AFTER UPDATE ON summaries BEGIN
+                INSERT INTO summaries_fts (summaries_fts, rowid, title, summary, transcript)
+                VALUES ('delete', old.id, old.title, old.summary, old.transcript);
+                INSERT INTO summaries_fts (rowid, title, summary, transcript)
+                VALUES (new.id, new.title, new.summary, new.transcript);
+            END;
+        ''')
+
     def is_processed(self, video_id: str) -> bool:
         """Check if a video has already been processed."""
+        if video_id in self._processed_ids:
+            return True
+
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
 
             cursor.execute(
@@ -145,17 +294,20 @@ class VideoDatabase:
             )
 
             result = cursor.fetchone() is not None
-            conn.close()
+            self._release(conn)
+
+            if result and self.persistent:
+                self._processed_ids.add(video_id)
 
             return result
         except sqlite3.Error as e:
-            logger.error(f"Database query error: {e}")
+            logger.error("Database query error: %s", e)
             return False
 
     def mark_processed(self, video_id: str, title: str, url: str, podcast_id: Optional[int] = None):
         """Mark a video as processed."""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
 
             cursor.execute(
@@ -164,12 +316,377 @@ class VideoDatabase:
             )
 
             conn.commit()
-            conn.close()
-            logger.info(f"Marked video {video_id} as processed")
+            self._release(conn)
+
+            if self.persistent:
+                self._processed_ids.add(video_id)
+
+            logger.info("Marked video %s as processed", video_id)
+        except sqlite3.Error as e:
+            logger.error("Database insert error: %s", e)
+            raise
+
+    def get_cached_transcript(self, video_id: str) -> Optional[str]:
+        """Return a previously cached transcript, if any."""
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            cursor.execute(
+                'SELECT transcript FROM transcripts WHERE video_id = ?',
+                (video_id,)
+            )
+
+            row = cursor.fetchone()
+            self._release(conn)
+
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            logger.error("Database query error: %s", e)
+            return None
+
+    def cached_transcript_ids(self, video_ids: List[str]) -> Set[str]:
+        """Return which of the given IDs already have a cached transcript."""
+        cached = set()
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            # Chunked to stay under SQLite's parameter limit
+            for start in range(0, len(video_ids), 500):
+                chunk = video_ids[start:start + 500]
+                cursor.execute(
+                    f'SELECT video_id FROM transcripts WHERE video_id IN ({",".join("?" * len(chunk))})',
+                    chunk
+                )
+                cached.update(row[0] for row in cursor.fetchall())
+
+            self._release(conn)
+        except sqlite3.Error as e:
+            logger.error("Database query error: %s", e)
+
+        return cached
+
+    def cache_transcript(self, video_id: str, transcript: str, source: str):
+        """Store a transcript for later runs."""
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            cursor.execute(
+                'INSERT OR REPLACE INTO transcripts (video_id, source, transcript) VALUES (?, ?, ?)',
+                (video_id, source, transcript)
+            )
+
+            conn.commit()
+            self._release(conn)
+        except sqlite3.Error as e:
+            logger.error("Database insert error: %s", e)
+
+    def transcript_retry_at(self, video_id: str) -> Optional[float]:
+        """Return when a failed transcript may be fetched again (epoch seconds), if recorded."""
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            cursor.execute(
+                'SELECT next_attempt_at FROM transcript_failures WHERE video_id = ?',
+                (video_id,)
+            )
+
+            row = cursor.fetchone()
+            self._release(conn)
+
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            logger.error("Database query error: %s", e)
+            return None
+
+    def record_transcript_failure(self, video_id: str, reason: str) -> Optional[float]:
+        """Record a failed transcript fetch and schedule the next attempt.
+
+        Returns the next attempt time (epoch seconds), or None once the
+        reason's attempt limit is used up.
+        """
+        first_delay, max_delay, max_attempts = TRANSCRIPT_RETRY_POLICY.get(
+            reason, TRANSCRIPT_RETRY_POLICY['transient']
+        )
+
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            cursor.execute(
+                'SELECT reason, attempts FROM transcript_failures WHERE video_id = ?',
+                (video_id,)
+            )
+            row = cursor.fetchone()
+            # A change of reason starts a fresh backoff schedule
+            attempts = row[1] + 1 if row and row[0] == reason else 1
+
+            if attempts >= max_attempts:
+                next_attempt_at = None
+            else:
+                delay = min(first_delay * math.pow(2, attempts - 1), max_delay)
+                next_attempt_at = time.time() + delay
+
+            cursor.execute(
+                '''INSERT OR REPLACE INTO transcript_failures
+                   (video_id, reason, attempts, next_attempt_at, updated_at)
+                   VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)''',
+                (video_id, reason, attempts, next_attempt_at)
+            )
+
+            conn.commit()
+            self._release(conn)
+
+            return next_attempt_at
+        except sqlite3.Error as e:
+            logger.error("Database insert error: %s", e)
+            return None
+
+    def clear_transcript_failure(self, video_id: str):
+        """Forget a recorded transcript failure once the transcript was fetched."""
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            cursor.execute('DELETE FROM transcript_failures WHERE video_id = ?', (video_id,))
+
+            conn.commit()
+            self._release(conn)
+        except sqlite3.Error as e:
+            logger.error("Database delete error: %s", e)
+
+    def count_processed(self, podcast_id: int) -> int:
+        """Count processed videos belonging to a podcast."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT COUNT(*) FROM processed_videos WHERE podcast_id = ?',
+                (podcast_id,)
+            )
+            return cursor.fetchone()[0]
+        finally:
+            self._release(conn)
+
+    def history_page(self, after: Optional[Tuple[str, str]] = None, limit: int = 500,
+                     podcast_id: Optional[int] = None, newest_first: bool = False,
+                     include_summaries: bool = False) -> Tuple[List[Dict], Optional[Tuple[str, str]]]:
+        """Return one page of processed episodes and the cursor for the next page.
+
+        Pages are ordered by (processed_at, video_id) and `after` is the
+        cursor returned with the previous page, so each page is an index
+        seek rather than an OFFSET scan. The next cursor is None on the last page.
+        """
+        columns = 'pv.video_id, pv.podcast_id, pv.title, pv.url, pv.processed_at'
+        joins = ''
+        if include_summaries:
+            columns += ', s.summary'
+            joins = 'LEFT JOIN summaries s ON s.video_id = pv.video_id'
+
+        conditions = []
+        params: List = []
+        if podcast_id is not None:
+            conditions.append('pv.podcast_id = ?')
+            params.append(podcast_id)
+        if after is not None:
+            conditions.append(f"(pv.processed_at, pv.video_id) {'<' if newest_first else '>'} (?, ?)")
+            params.extend(after)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        order = 'DESC' if newest_first else 'ASC'
+        params.append(limit)
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT {columns}
+                FROM processed_videos pv
+                {joins}
+                {where}
+                ORDER BY pv.processed_at {order}, pv.video_id {order}
+                LIMIT ?
+            ''', params)
+            names = [column[0] for column in cursor.description]
+            rows = [dict(zip(names, row)) for row in cursor.fetchall()]
+        finally:
+            self._release(conn)
+
+        next_cursor = (rows[-1]['processed_at'], rows[-1]['video_id']) if len(rows) == limit else None
+        return rows, next_cursor
+
+    def iter_history(self, page_size: int = 500, podcast_id: Optional[int] = None,
+                     newest_first: bool = False, include_summaries: bool = False) -> Iterator[Dict]:
+        """Yield every processed episode, fetching `page_size` rows at a time.
+
+        Each page is its own short query, so iterating a large history holds
+        neither the whole table in memory nor a long-running read transaction.
+        """
+        cursor = None
+        while True:
+            rows, cursor = self.history_page(cursor, page_size, podcast_id, newest_first, include_summaries)
+            yield from rows
+            if cursor is None:
+                return
+
+    def save_summary(self, video_id: str, title: str, url: str, summary: str,
+                     podcast_id: Optional[int] = None, transcript: Optional[str] = None):
+        """Store a generated summary (and optionally its transcript) for later search."""
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            cursor.execute(
+                '''INSERT INTO summaries (video_id, podcast_id, title, url, summary, transcript)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(video_id) DO UPDATE SET
+                       podcast_id = excluded.podcast_id, title = excluded.title, url = excluded.url,
+                       summary = excluded.summary, transcript = excluded.transcript''',
+                (video_id, podcast_id, title, url, summary, transcript)
+            )
+
+            conn.commit()
+            self._release(conn)
+        except sqlite3.Error as e:
+            logger.error("Database insert error: %s", e)
+
+    def get_summary(self, video_id: str) -> Optional[str]:
+        """Return the stored summary of an episode, if any."""
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            cursor.execute('SELECT summary FROM summaries WHERE video_id = ?', (video_id,))
+
+            row = cursor.fetchone()
+            self._release(conn)
+
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            logger.error("Database query error: %s", e)
+            return None
+
+    def queue_digest(self, recipients: List[str], item: Dict):
+        """Hold a summary for the digest emails of several recipients.
+
+        `item` has 'video_id', 'podcast', 'title', 'url' and 'summary'.
+        """
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            cursor.executemany(
+                '''INSERT OR IGNORE INTO digest_queue (recipient, video_id, podcast, title, url, summary)
+                   VALUES (?, ?, ?, ?, ?, ?)''',
+                [(recipient, item['video_id'], item['podcast'], item['title'], item['url'], item['summary'])
+                 for recipient in recipients]
+            )
+
+            conn.commit()
+            self._release(conn)
         except sqlite3.Error as e:
-            logger.error(f"Database insert error: {e}")
+            logger.error("Database insert error: %s", e)
             raise
 
+    def pending_digests(self) -> Dict[str, List[Dict]]:
+        """Return queued digest items by recipient, oldest first; each item has its queue 'id'."""
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            cursor.execute('SELECT id, recipient, video_id, podcast, title, url, summary FROM digest_queue ORDER BY id')
+            columns = [description[0] for description in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            self._release(conn)
+        except sqlite3.Error as e:
+            logger.error("Database query error: %s", e)
+            return {}
+
+        pending: Dict[str, List[Dict]] = {}
+        for item in rows:
+            pending.setdefault(item.pop('recipient'), []).append(item)
+        return pending
+
+    def clear_digest(self, recipient: str, up_to_id: int):
+        """Drop a recipient's queued digest items once they were sent."""
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            cursor.execute('DELETE FROM digest_queue WHERE recipient = ? AND id <= ?', (recipient, up_to_id))
+
+            conn.commit()
+            self._release(conn)
+        except sqlite3.Error as e:
+            logger.error("Database delete error: %s", e)
+
+    @staticmethod
+    def _match_expression(query: str) -> str:
+        """Turn free text into an FTS5 query that matches all words (prefix match on the last)."""
+        words = [word.replace('"', '""') for word in query.split()]
+        terms = [f'"{word}"' for word in words]
+        if terms:
+            terms[-1] += '*'
+        return ' '.join(terms)
+
+    def search_summaries(self, query: str, limit: int = 20, podcast_id: Optional[int] = None,
+                         raw: bool = False) -> List[Dict]:
+        """Full-text search over stored summaries, best matches first.
+
+        Title hits rank above summary hits, which rank above transcript hits.
+        Each result has 'video_id', 'podcast_id', 'title', 'url', 'created_at',
+        'snippet' (matches wrapped in [brackets]) and 'score' (lower is better).
+        With `raw`, `query` is passed to FTS5 as-is (AND/OR/NEAR, column filters).
+        """
+        match = query if raw else self._match_expression(query)
+        if not match:
+            return []
+
+        sql = '''
+            SELECT s.video_id, s.podcast_id, s.title, s.url, s.created_at,
+                   snippet(summaries_fts, -1, '[', ']', '...', 16) AS snippet,
+                   bm25(summaries_fts, 10.0, 2.0, 1.0) AS score
+            FROM summaries_fts
+            JOIN summaries s ON s.id = summaries_fts.rowid
+            WHERE summaries_fts MATCH ?
+        '''
+        params: List = [match]
+        if podcast_id is not None:
+            sql += ' AND s.podcast_id = ?'
+            params.append(podcast_id)
+        sql += ' ORDER BY score LIMIT ?'
+        params.append(limit)
+
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            self._release(conn)
+            return rows
+        except sqlite3.Error as e:
+            logger.error("Summary search error: %s", e)
+            return []
+
+
+def fetch_feed(url: str, timeout: Optional[float] = None):
+    """Fetch and parse an RSS/Atom feed, giving up after `timeout` seconds.
+
+    feedparser has no timeout of its own, so with a timeout the document is
+    downloaded here and handed to feedparser as bytes.
+    """
+    if timeout is None:
+        return feedparser.parse(url)
+
+    request = urllib.request.Request(url, headers={'User-Agent': feedparser.USER_AGENT})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        headers = {key.lower(): value for key, value in response.headers.items()}
+        return feedparser.parse(response.read(), response_headers=headers)
+
 
 class TranscriptExtractor:
     """Extract and process YouTube video transcripts."""
@@ -188,88 +705,507 @@ class TranscriptExtractor:
         return None
 
     @staticmethod
-    def get_transcript(video_id: str) -> Optional[str]:
+    def get_transcript(video_id: str, timeout: Optional[float] = None,
+                       breaker: Optional[CircuitBreaker] = None) -> Optional[str]:
         """Fetch and concatenate the video transcript."""
+        segments = TranscriptExtractor.get_transcript_segments(video_id, timeout, breaker)
+        if segments is None:
+            return None
+
+        # Concatenate all text segments
+        return ' '.join(segments)
+
+    @staticmethod
+    def get_transcript_segments(video_id: str, timeout: Optional[float] = None,
+                                breaker: Optional[CircuitBreaker] = None) -> Optional[List[str]]:
+        """Fetch the raw caption text segments of a video.
+
+        Raises StageTimeout if the fetch takes longer than `timeout` seconds,
+        and CircuitOpenError if `breaker` refuses the call, so a slow or
+        unavailable upstream is not mistaken for a missing transcript.
+        """
+        segments, _ = TranscriptExtractor.fetch_transcript_segments(video_id, timeout, breaker)
+        return segments
+
+    @staticmethod
+    def fetch_transcript_segments(video_id: str, timeout: Optional[float] = None,
+                                  breaker: Optional[CircuitBreaker] = None
+                                  ) -> Tuple[Optional[List[str]], Optional[str]]:
+        """Fetch caption segments, returning (segments, failure reason).
+
+        The reason is one of the TRANSCRIPT_RETRY_POLICY keys when no
+        transcript could be fetched, and None on success.
+        """
+        if breaker is not None:
+            breaker.check()
+
         try:
             # Try to get English transcript
-            transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=['en'])
+            transcript_list = run_with_timeout(
+                YouTubeTranscriptApi.get_transcript, timeout, video_id, languages=['en']
+            )
 
-            # Concatenate all text segments
-            full_transcript = ' '.join([entry['text'] for entry in transcript_list])
+            segments = [entry['text'] for entry in transcript_list]
 
-            logger.info(f"Successfully extracted transcript for video {video_id}")
-            return full_transcript
+            if breaker is not None:
+                breaker.record_success()
+
+            logger.info("Successfully extracted transcript for video %s", video_id)
+            return segments, None
 
         except NoTranscriptFound:
-            logger.warning(f"No transcript found for video {video_id}")
-            return None
+            logger.warning("No transcript found for video %s", video_id)
+            # The service answered; a missing transcript is not an outage
+            if breaker is not None:
+                breaker.record_success()
+            return None, 'NoTranscriptFound'
 
         except TranscriptsDisabled:
-            logger.warning(f"Transcripts are disabled for video {video_id}")
-            return None
+            logger.warning("Transcripts are disabled for video %s", video_id)
+            if breaker is not None:
+                breaker.record_success()
+            return None, 'TranscriptsDisabled'
+
+        except StageTimeout:
+            logger.error("Timed out fetching transcript for video %s", video_id)
+            if breaker is not None:
+                breaker.record_failure()
+            raise
 
         except Exception as e:
-            logger.error(f"Error extracting transcript for video {video_id}: {e}")
-            return None
+            logger.error("Error extracting transcript for video %s: %s", video_id, e)
+            if breaker is not None:
+                breaker.record_failure()
+            return None, 'transient'
+
+
+SUMMARY_FORMAT = """- A brief overview (1-2 sentences)
+- Key points covered (bullet points)
+- Main takeaways (bullet points)
+- Technologies discussed (bullet points)
+- Talking points (bullet points)
+
+Prepare this as notes that allow the reader to stay up to date with the AI/technology landscape and be able to talk about it
+including interesting points brought up"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+class _BatchStopped(Exception):
+    """A batch caller declined to send another request."""
 
 
 class GeminiSummarizer:
     """Generate summaries using Google Gemini AI."""
 
-    def __init__(self, api_key: str, model: str = 'gemini-2.5-flash'):
+    def __init__(self, api_key: str, model: str = 'gemini-2.5-flash',
+                 timeout: Optional[float] = None, hedge_percentile: Optional[float] = None,
+                 breaker: Optional[CircuitBreaker] = None):
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(model)
+        self.timeout = timeout
+        # When set, a duplicate request is fired once a call runs longer than
+        # this percentile of recent latencies
+        self.hedge_percentile = hedge_percentile
+        self.latency = LatencyTracker()
+        self.breaker = breaker
+
+    def _generate(self, prompt: str, timeout: Optional[float] = None,
+                  on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """Run one generate_content call with timeout and optional hedging.
+
+        With `on_chunk`, the response is streamed and each piece of text is
+        passed to it as it arrives.
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        hedge_after = self.latency.percentile(self.hedge_percentile) if self.hedge_percentile else None
+
+        if self.breaker is not None:
+            self.breaker.check()
+
+        started = time.monotonic()
+        try:
+            if on_chunk is not None:
+                # A stream already shown to the reader can't be raced against a duplicate
+                text = self._stream(prompt, timeout, on_chunk)
+            elif hedge_after is not None and (timeout is None or hedge_after < timeout):
+                text = run_hedged(self.model.generate_content, timeout, hedge_after, prompt).text
+            else:
+                text = run_with_timeout(self.model.generate_content, timeout, prompt).text
+        except Exception:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise
 
-    def generate_summary(self, transcript: str, video_title: str) -> Optional[str]:
-        """Generate a concise summary of the video transcript."""
+        if self.breaker is not None:
+            self.breaker.record_success()
+        self.latency.record(time.monotonic() - started)
+        return text
+
+    def _stream(self, prompt: str, timeout: Optional[float], on_chunk: Callable[[str], None]) -> str:
+        """Stream one response, logging time to first token and to completion separately.
+
+        `on_chunk` runs on the calling thread, so it is never called again
+        once this returns or times out.
+        """
+        started = time.monotonic()
+        first_token: List[float] = []
+        parts: List[str] = []
+
+        def stream_generate_content() -> Iterator[str]:
+            for chunk in self.model.generate_content(prompt, stream=True):
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks with no text part (e.g. only a finish reason)
+                    continue
+                if text:
+                    yield text
+
+        chunks = iterate_with_timeout(stream_generate_content, timeout)
+        try:
+            for text in chunks:
+                if not parts:
+                    first_token.append(time.monotonic() - started)
+                parts.append(text)
+                if on_chunk is None:
+                    continue
+                try:
+                    on_chunk(text)
+                except Exception as e:
+                    # A display or spool problem is not a Gemini failure; keep the summary
+                    logger.warning("Could not pass on streamed output, continuing without it: %s", e)
+                    on_chunk = None
+        finally:
+            chunks.close()
+        text = ''.join(parts)
+
+        complete = time.monotonic() - started
+        if first_token:
+            log_timing('first_token', round(first_token[0] * 1000, 1))
+        log_timing('complete', round(complete * 1000, 1))
+        logger.info("Streamed response: first token after %.2fs, complete after %.2fs",
+                    first_token[0] if first_token else complete, complete)
+        return text
+
+    def generate_summary(self, transcript: str, video_title: str,
+                         timeout: Optional[float] = None,
+                         on_chunk: Optional[Callable[[str], None]] = None) -> Optional[str]:
+        """Generate a concise summary of the video transcript.
+
+        Pass `on_chunk` to stream the summary as it is generated.
+        """
         try:
             prompt = f"""Please analyze the following video transcript from "{video_title}" and create a concise summary.
 
 Format your summary as:
-- A brief overview (1-2 sentences)
-- Key points covered (bullet points)
-- Main takeaways (bullet points)
-- Technologies discussed (bullet points)
-- Talking points (bullet points)
-
-Prepare this as notes that allow the reader to stay up to date with the AI/technology landscape and be able to talk about it
-including interesting points brought up
+{SUMMARY_FORMAT}
 
 Transcript:
 {transcript}
 """
 
-            response = self.model.generate_content(prompt)
-            summary = response.text
-            logger.info(f"Successfully generated summary for '{video_title}'")
+            summary = self._generate(prompt, timeout, on_chunk)
+            logger.info("Successfully generated summary for '%s'", video_title)
             return summary
 
+        except CircuitOpenError:
+            # Not a failure of this episode; the caller defers it
+            raise
+
         except Exception as e:
-            logger.error(f"Gemini API error: {e}")
+            logger.error("Gemini API error: %s", e)
             return None
 
+    def generate_summaries_batch(self, items: List[Tuple[str, str]], max_tokens: int = 8000,
+                                 timeout: Union[float, Callable[[], Optional[float]], None] = None,
+                                 on_request: Optional[Callable[[List[int]], bool]] = None
+                                 ) -> Tuple[List[Optional[str]], List[int]]:
+        """Summarize several short (transcript, title) inputs with as few requests as possible.
+
+        Inputs are packed into prompts of up to `max_tokens` estimated input
+        tokens. Any item whose packed response cannot be parsed falls back to
+        its own `generate_summary` request.
+
+        `timeout` may be a callable, evaluated before every request so each
+        one gets what is left of a deadline; it may raise `DeadlineExceeded`.
+        `on_request` is called with the item indexes a request carries just
+        before it is sent (e.g. to charge a budget); returning False refuses
+        it. A refused request, an expired deadline or an open circuit stops
+        the batch; the summaries gathered so far are returned along with the
+        indexes left for later.
+        """
+        summaries: List[Optional[str]] = [None] * len(items)
+        # Inputs whose own request finished; a failure there is final, not deferred
+        finished: Set[int] = set()
+        request_timeout = timeout if callable(timeout) else lambda: timeout
+
+        def admit(indexes: List[int]) -> Optional[float]:
+            seconds = request_timeout()
+            # Don't charge the caller for a request the breaker would refuse
+            if self.breaker is not None and not self.breaker.available():
+                raise CircuitOpenError(f"{self.breaker.name} circuit is open")
+            if on_request is not None and not on_request(indexes):
+                raise _BatchStopped("caller declined the next request")
+            return seconds
+
+        def summarize_alone(index: int):
+            seconds = admit([index])
+            summaries[index] = self.generate_summary(*items[index], timeout=seconds)
+            finished.add(index)
+
+        try:
+            for group in self._pack(items, max_tokens):
+                if len(group) == 1:
+                    summarize_alone(group[0])
+                    continue
+
+                parsed = self._generate_packed([items[i] for i in group], admit(group))
+
+                for position, index in enumerate(group):
+                    summary = parsed.get(position + 1)
+                    if summary:
+                        summaries[index] = summary
+                        logger.info("Successfully generated summary for '%s' (batched)", items[index][1])
+                    else:
+                        logger.warning("Batched summary missing for '%s', retrying alone", items[index][1])
+                        summarize_alone(index)
+
+        except (_BatchStopped, CircuitOpenError, DeadlineExceeded) as e:
+            deferred = [index for index in range(len(items))
+                        if summaries[index] is None and index not in finished]
+            logger.warning("Stopping packed summaries with %s inputs left for later: %s", len(deferred), e)
+            return summaries, deferred
+
+        return summaries, []
+
+    @staticmethod
+    def _pack(items: List[Tuple[str, str]], max_tokens: int) -> List[List[int]]:
+        """Group item indexes so each group's estimated size fits the budget."""
+        groups: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+
+        for index, (transcript, title) in enumerate(items):
+            tokens = estimate_tokens(transcript) + estimate_tokens(title) + 20
+            if current and current_tokens + tokens > max_tokens:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+
+        if current:
+            groups.append(current)
+        return groups
+
+    def _generate_packed(self, items: List[Tuple[str, str]],
+                         timeout: Optional[float] = None) -> Dict[int, str]:
+        """Send one packed request; return summaries keyed by 1-based item number."""
+        episodes = '\n\n'.join(
+            f'Episode {number}: "{title}"\n<<<\n{transcript}\n>>>'
+            for number, (transcript, title) in enumerate(items, 1)
+        )
+
+        prompt = f"""Please analyze each of the following {len(items)} podcast episodes and create a concise summary for each one.
+
+Format each summary as:
+{SUMMARY_FORMAT}
+
+Respond with only a JSON array containing one object per episode, in order, of the form
+{{"id": <episode number>, "summary": "<the summary as markdown text>"}}
+
+{episodes}
+"""
+
+        try:
+            return self._parse_packed(self._generate(prompt, timeout), len(items))
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error("Gemini API error (batched request): %s", e)
+            return {}
+
+    @staticmethod
+    def _parse_packed(text: str, count: int) -> Dict[int, str]:
+        """Extract {number: summary} from a packed JSON response, ignoring junk."""
+        start, end = text.find('['), text.rfind(']')
+        if start == -1 or end <= start:
+            logger.warning("Batched response was not a JSON array")
+            return {}
+
+        try:
+            records = json.loads(text[start:end + 1])
+        except json.JSONDecodeError as e:
+            logger.warning("Could not parse batched response: %s", e)
+            return {}
+
+        parsed = {}
+        for record in records if isinstance(records, list) else []:
+            if not isinstance(record, dict):
+                continue
+            number, summary = record.get('id'), record.get('summary')
+            if isinstance(number, int) and 1 <= number <= count and isinstance(summary, str) and summary.strip():
+                parsed[number] = summary.strip()
+        return parsed
+
 
 class EmailSender:
     """Send email notifications with video summaries."""
 
-    def __init__(self, smtp_host: str, smtp_port: int, username: str, password: str, from_addr: str):
+    def __init__(self, smtp_host: str, smtp_port: int, username: str, password: str, from_addr: str,
+                 keep_alive: bool = False, timeout: Optional[float] = None,
+                 breaker: Optional[CircuitBreaker] = None, max_recipients: int = 50):
         self.smtp_host = smtp_host
         self.smtp_port = smtp_port
         self.username = username
         self.password = password
         self.from_addr = from_addr
+        # Reuse one authenticated session across messages (daemon mode)
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.breaker = breaker
+        # RCPTs per SMTP transaction; many servers reject more than 100
+        self.max_recipients = max_recipients
+        self._server: Optional[smtplib.SMTP] = None
+        self._session_depth = 0
+        self._warming: Optional[threading.Thread] = None
+
+    def _open_server(self, timeout: Optional[float] = None) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP session."""
+        if timeout is None:
+            timeout = self.timeout
+        if timeout is None:
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port)
+        else:
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=timeout)
+        server.starttls()
+        server.login(self.username, self.password)
+        return server
+
+    def _get_server(self, timeout: Optional[float] = None) -> smtplib.SMTP:
+        """Return the cached SMTP session, reconnecting if it went stale."""
+        if self._server is not None:
+            if timeout is not None and self._server.sock is not None:
+                self._server.sock.settimeout(timeout)
+            try:
+                if self._server.noop()[0] == 250:
+                    return self._server
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.close()
+
+        self._server = self._open_server(timeout)
+        return self._server
+
+    def warm_up(self, timeout: Optional[float] = None):
+        """Connect (or check) the pooled session in the background, ahead of the next send.
+
+        Only applies while a session is pooled; the next send waits for it.
+        """
+        if not (self.keep_alive or self._session_depth) or self._warming is not None:
+            return
+        if self.breaker is not None and not self.breaker.available():
+            return
+
+        def warm():
+            try:
+                self._get_server(timeout)
+            except (smtplib.SMTPException, OSError) as e:
+                # The send reconnects and reports the error
+                logger.debug("SMTP warm-up failed: %s", e)
+
+        self._warming = threading.Thread(target=warm, name='smtp-warmup', daemon=True)
+        self._warming.start()
+
+    def _wait_for_warm_up(self):
+        if self._warming is not None:
+            self._warming.join()
+            self._warming = None
+
+    def close(self):
+        """Close the cached SMTP session, if any."""
+        self._wait_for_warm_up()
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+
+    @contextmanager
+    def session(self):
+        """Keep one SMTP session open for every message sent inside the block."""
+        self._session_depth += 1
+        try:
+            yield self
+        finally:
+            self._session_depth -= 1
+            if not self._session_depth and not self.keep_alive:
+                self.close()
+
+    def _send(self, msg: MIMEMultipart, to_addrs: List[str], description: str,
+              timeout: Optional[float] = None) -> bool:
+        """Send `msg` to every address, at most `max_recipients` RCPTs per transaction."""
+        if self.breaker is not None and not self.breaker.allow():
+            logger.error("SMTP circuit is open, not sending email for: %s", description)
+            return False
+
+        self._wait_for_warm_up()
 
-    def send_summary(self, to_addr: str, video_title: str, video_url: str, summary: str) -> bool:
-        """Send an email with the video summary."""
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"New Video Summary: {video_title}"
-            msg['From'] = self.from_addr
-            msg['To'] = to_addr
-
-            # Create email body
-            text_body = f"""
+            pooled = self.keep_alive or self._session_depth > 0
+            server = self._get_server(timeout) if pooled else self._open_server(timeout)
+            try:
+                for start in range(0, len(to_addrs), self.max_recipients):
+                    chunk = to_addrs[start:start + self.max_recipients]
+                    refused = server.send_message(msg, to_addrs=chunk)
+                    if refused:
+                        logger.warning("Recipients refused for %s: %s", description, ', '.join(refused))
+            finally:
+                if not pooled:
+                    server.quit()
+
+            logger.info("Email sent successfully for %s (%s recipients)", description, len(to_addrs))
+            if self.breaker is not None:
+                self.breaker.record_success()
+            return True
+
+        except smtplib.SMTPException as e:
+            logger.error("SMTP error sending email: %s", e)
+            # Drop a possibly broken cached session so the next send reconnects
+            self.close()
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            return False
+
+        except Exception as e:
+            logger.error("Error sending email: %s", e)
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            return False
+
+    def _new_message(self, subject: str, to_addrs: List[str], text_body: str, html_body: str) -> MIMEMultipart:
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = self.from_addr
+        # Several recipients are sent as blind copies: the envelope carries
+        # the addresses, the header does not expose them to each other
+        msg['To'] = to_addrs[0] if len(to_addrs) == 1 else 'undisclosed-recipients:;'
+        msg.attach(MIMEText(text_body, 'plain'))
+        msg.attach(MIMEText(html_body, 'html'))
+        return msg
+
+    def send_summary(self, to_addrs: Union[str, List[str]], video_title: str, video_url: str, summary: str,
+                     timeout: Optional[float] = None) -> bool:
+        """Send an email with the video summary to one or more recipients."""
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+
+        # Create email body
+        text_body = f"""
 New YouTube Video Summary
 
 Title: {video_title}
@@ -282,7 +1218,7 @@ Summary:
 This summary was automatically generated using Claude AI.
 """
 
-            html_body = f"""
+        html_body = f"""
 <html>
 <head></head>
 <body>
@@ -299,28 +1235,61 @@ This summary was automatically generated using Claude AI.
 </html>
 """
 
-            # Attach both plain text and HTML versions
-            part1 = MIMEText(text_body, 'plain')
-            part2 = MIMEText(html_body, 'html')
-            msg.attach(part1)
-            msg.attach(part2)
-
-            # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
-
-            logger.info(f"Email sent successfully for video: {video_title}")
-            return True
+        msg = self._new_message(f"New Video Summary: {video_title}", to_addrs, text_body, html_body)
+        return self._send(msg, to_addrs, f"video: {video_title}", timeout)
+
+    def send_digest(self, to_addr: str, items: List[Dict], timeout: Optional[float] = None) -> bool:
+        """Send one email with several summaries.
+
+        Each item has 'podcast', 'title', 'url' and 'summary', and optionally
+        a 'topic' heading shown above consecutive items that share it. Items
+        without a topic after a topic group go under "Other episodes".
+        """
+        text_parts = []
+        html_parts = []
+        topic = None
+        for item in items:
+            text_heading = html_heading = ''
+            if item.get('topic') != topic:
+                heading = item.get('topic') or 'Other episodes'
+                text_heading = f"\n== {heading} ==\n"
+                html_heading = f"\n    <h2>{heading}</h2>"
+            topic = item.get('topic')
+
+            text_parts.append(f"""{text_heading}
+{item['podcast']}: {item['title']}
+URL: {item['url']}
+
+{item['summary']}
+""")
+            html_parts.append(f"""{html_heading}
+    <h3>{item['podcast']}: {item['title']}</h3>
+    <p><a href="{item['url']}">{item['url']}</a></p>
+    <pre style="white-space: pre-wrap; font-family: Arial, sans-serif;">{item['summary']}</pre>
+""")
+
+        text_body = f"""
+Podcast Summary Digest ({len(items)} episodes)
+{'---'.join(text_parts)}
+---
+These summaries were automatically generated using Claude AI.
+"""
 
-        except smtplib.SMTPException as e:
-            logger.error(f"SMTP error sending email: {e}")
-            return False
+        html_body = f"""
+<html>
+<head></head>
+<body>
+    <h2>Podcast Summary Digest ({len(items)} episodes)</h2>
+{'    <hr>'.join(html_parts)}
+    <hr>
+    <p style="color: #666; font-size: 0.9em;">These summaries were automatically generated using Claude AI.</p>
+</body>
+</html>
+"""
 
-        except Exception as e:
-            logger.error(f"Error sending email: {e}")
-            return False
+        subject = f"Podcast Summary Digest: {len(items)} new episode{'s' if len(items) != 1 else ''}"
+        msg = self._new_message(subject, [to_addr], text_body, html_body)
+        return self._send(msg, [to_addr], f"digest to {to_addr}", timeout)
 
 
 class YouTubeSummarizer:
@@ -350,10 +1319,10 @@ class YouTubeSummarizer:
             feed = feedparser.parse(self.config.get('youtube_rss_url'))
 
             if feed.bozo:
-                logger.error(f"Error parsing RSS feed: {feed.bozo_exception}")
+                logger.error("Error parsing RSS feed: %s", feed.bozo_exception)
                 return
 
-            logger.info(f"Found {len(feed.entries)} entries in feed")
+            logger.info("Found %s entries in feed", len(feed.entries))
 
             processed_count = 0
             skipped_count = 0
@@ -374,23 +1343,23 @@ class YouTubeSummarizer:
                         if hasattr(entry, 'yt_videoid'):
                             video_id = entry.yt_videoid
                         else:
-                            logger.warning(f"Could not extract video ID from: {video_url}")
+                            logger.warning("Could not extract video ID from: %s", video_url)
                             error_count += 1
                             continue
 
                     # Check if already processed
                     if self.db.is_processed(video_id):
-                        logger.info(f"Skipping already processed video: {video_title}")
+                        logger.info("Skipping already processed video: %s", video_title)
                         skipped_count += 1
                         continue
 
-                    logger.info(f"Processing new video: {video_title} ({video_id})")
+                    logger.info("Processing new video: %s (%s)", video_title, video_id)
 
                     # Extract transcript
                     transcript = TranscriptExtractor.get_transcript(video_id)
 
                     if not transcript:
-                        logger.warning(f"No transcript available for: {video_title}")
+                        logger.warning("No transcript available for: %s", video_title)
                         # Still mark as processed to avoid repeated attempts
                         self.db.mark_processed(video_id, video_title, video_url)
                         error_count += 1
@@ -400,10 +1369,12 @@ class YouTubeSummarizer:
                     summary = self.summarizer.generate_summary(transcript, video_title)
 
                     if not summary:
-                        logger.warning(f"Failed to generate summary for: {video_title}")
+                        logger.warning("Failed to generate summary for: %s", video_title)
                         error_count += 1
                         continue
 
+                    self.db.save_summary(video_id, video_title, video_url, summary)
+
                     # Send email
                     email_sent = self.email_sender.send_summary(
                         self.config.get('email_to'),
@@ -413,7 +1384,7 @@ class YouTubeSummarizer:
                     )
 
                     if not email_sent:
-                        logger.error(f"Failed to send email for: {video_title}")
+                        logger.error("Failed to send email for: %s", video_title)
                         error_count += 1
                         continue
 
@@ -421,23 +1392,27 @@ class YouTubeSummarizer:
                     self.db.mark_processed(video_id, video_title, video_url)
                     processed_count += 1
 
-                    logger.info(f"Successfully processed and sent: {video_title}")
+                    logger.info("Successfully processed and sent: %s", video_title)
 
                 except Exception as e:
-                    logger.error(f"Error processing entry '{video_title}': {e}")
+                    logger.error("Error processing entry '%s': %s", video_title, e)
                     error_count += 1
                     continue
 
             # Summary
-            logger.info(f"Processing complete. Processed: {processed_count}, Skipped: {skipped_count}, Errors: {error_count}")
+            logger.info("Processing complete. Processed: %s, Skipped: %s, Errors: %s", processed_count, skipped_count, error_count)
 
         except Exception as e:
-            logger.error(f"Fatal error in process_feed: {e}")
+            logger.error("Fatal error in process_feed: %s", e)
             raise
 
 
 def main():
     """Main entry point for the script."""
+    parser = argparse.ArgumentParser(description='YouTube Podcast Episode Summarizer')
+    add_profile_args(parser)
+    args = parser.parse_args()
+
     try:
         logger.info("=" * 60)
         logger.info("YouTube Podcast Episode Summarizer Started")
@@ -446,16 +1421,21 @@ def main():
         # Load configuration
         config = Config()
 
+        profiler = nullcontext()
+        if args.profile:
+            profiler = Profiler(args.profile, args.profile_interval / 1000 or None, args.profile_top)
+
         # Initialize and run summarizer
-        summarizer = YouTubeSummarizer(config)
-        summarizer.process_feed()
+        with profiler:
+            summarizer = YouTubeSummarizer(config)
+            summarizer.process_feed()
 
         logger.info("=" * 60)
         logger.info("YouTube Podcast Episode Summarizer Completed")
         logger.info("=" * 60)
 
     except Exception as e:
-        logger.error(f"Fatal error: {e}")
+        logger.error("Fatal error: %s", e)
         sys.exit(1)
 
 
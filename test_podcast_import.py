@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Check bulk podcast import against a local stand-in for iTunes and YouTube.
+Resolves OPML and plain-text subscription lists (RSS feeds, Apple Podcasts
+IDs, YouTube channel and @handle URLs) without network access:
+python test_podcast_import.py
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import tempfile
+import threading
+import subprocess
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'podcast_import.py')
+
+APPLE_ID = '1200000001'
+MISSING_APPLE_ID = '1200000002'
+CHANNEL_ID = 'UCstubchannel000000000000'
+HANDLE_CHANNEL_ID = 'UCstubhandle0000000000000'
+
+SCHEMA = """
+CREATE TABLE podcasts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel_id TEXT,
+    channel_name TEXT NOT NULL,
+    rss_url TEXT NOT NULL UNIQUE,
+    source TEXT DEFAULT 'youtube',
+    frequency_days INTEGER DEFAULT 7,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+class StubServer:
+    """Serves an iTunes lookup endpoint, a YouTube @handle page and two RSS feeds."""
+
+    def __init__(self):
+        self.lookups = []
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urllib.parse.urlparse(self.path)
+
+                if parsed.path == '/lookup':
+                    ids = urllib.parse.parse_qs(parsed.query)['id'][0].split(',')
+                    server.lookups.append(ids)
+                    results = [{'collectionId': int(APPLE_ID), 'collectionName': 'Stub Apple Show',
+                                'feedUrl': f'{server.url}/feeds/apple.xml'}] if APPLE_ID in ids else []
+                    self._send('application/json', json.dumps({'resultCount': len(results), 'results': results}))
+                elif parsed.path == '/@stubhandle':
+                    self._send('text/html', f'<html><head><meta property="og:title" content="Stub Handle Channel">'
+                                            f'</head><body>{{"channelId":"{HANDLE_CHANNEL_ID}"}}</body></html>')
+                elif parsed.path == '/feeds/plain.xml':
+                    self._send('application/rss+xml', '<?xml version="1.0"?><rss version="2.0"><channel>'
+                                                      '<title>Stub Plain Feed</title></channel></rss>')
+                else:
+                    self.send_response(404)
+                    self.end_headers()
+
+            def _send(self, content_type: str, body: str):
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def run_import(server: StubServer, db_path: str, path: str, *extra: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, SCRIPT, '--db', db_path, 'import', path, '--workers', '4',
+         '--itunes-url', f'{server.url}/lookup', '--youtube-url', server.url, *extra],
+        capture_output=True, text=True, timeout=60
+    )
+
+
+def podcast_rows(db_path: str):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(
+            'SELECT channel_id, channel_name, rss_url, source, frequency_days FROM podcasts ORDER BY rss_url'
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def test_podcast_import() -> bool:
+    """Resolve both list formats, check --dry-run writes nothing and re-imports add nothing."""
+    server = StubServer()
+
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            db_path = os.path.join(workdir, 'podcasts.db')
+            conn = sqlite3.connect(db_path)
+            conn.execute(SCHEMA)
+            conn.close()
+
+            opml_path = os.path.join(workdir, 'subscriptions.opml')
+            with open(opml_path, 'w', encoding='utf-8') as f:
+                f.write(f"""<?xml version="1.0" encoding="UTF-8"?>
+<opml version="2.0">
+  <head><title>Stub subscriptions</title></head>
+  <body>
+    <outline type="rss" text="OPML Feed" xmlUrl="{server.url}/feeds/opml.xml"/>
+    <outline type="rss" text="OPML Channel"
+             xmlUrl="https://www.youtube.com/feeds/videos.xml?channel_id={CHANNEL_ID}"/>
+  </body>
+</opml>
+""")
+
+            list_path = os.path.join(workdir, 'urls.txt')
+            with open(list_path, 'w', encoding='utf-8') as f:
+                f.write(f"""# One subscription per line
+{server.url}/feeds/plain.xml
+https://podcasts.apple.com/us/podcast/stub-show/id{APPLE_ID}
+https://podcasts.apple.com/us/podcast/gone/id{MISSING_APPLE_ID}
+https://www.youtube.com/@stubhandle
+ftp://example.com/feed.xml
+""")
+
+            expected = sorted([
+                (None, 'OPML Feed', f'{server.url}/feeds/opml.xml', 'rss', 3),
+                (CHANNEL_ID, 'OPML Channel',
+                 f'https://www.youtube.com/feeds/videos.xml?channel_id={CHANNEL_ID}', 'youtube', 3),
+                (None, 'Stub Plain Feed', f'{server.url}/feeds/plain.xml', 'rss', 3),
+                (None, 'Stub Apple Show', f'{server.url}/feeds/apple.xml', 'apple_podcasts', 3),
+                (HANDLE_CHANNEL_ID, 'Stub Handle Channel',
+                 f'https://www.youtube.com/feeds/videos.xml?channel_id={HANDLE_CHANNEL_ID}', 'youtube', 3),
+            ], key=lambda row: row[2])
+
+            print("Resolving the URL list with --dry-run...")
+            result = run_import(server, db_path, list_path, '--dry-run')
+            if result.returncode != 0 or 'Resolved 3, failed 2' not in result.stdout:
+                print(f"❌ Unexpected dry run output:\n{result.stdout}{result.stderr}")
+                return False
+            if podcast_rows(db_path):
+                print("❌ Dry run wrote to the database")
+                return False
+            if server.lookups[-1] != [APPLE_ID, MISSING_APPLE_ID]:
+                print(f"❌ Apple IDs were not looked up in one batch: {server.lookups}")
+                return False
+
+            print("Importing the OPML file and the URL list...")
+            for path in (opml_path, list_path):
+                result = run_import(server, db_path, path, '--frequency-days', '3')
+                if result.returncode != 0:
+                    print(f"❌ Import of {os.path.basename(path)} failed:\n{result.stdout}{result.stderr}")
+                    return False
+
+            rows = podcast_rows(db_path)
+            if rows != expected:
+                print(f"❌ Unexpected podcasts after import:\n{rows}")
+                return False
+
+            print("Importing both again...")
+            for path, resolved in ((opml_path, 2), (list_path, 3)):
+                result = run_import(server, db_path, path)
+                if f'Summary: 0 added, {resolved} already subscribed' not in result.stdout:
+                    print(f"❌ Re-import of {os.path.basename(path)} was not a no-op:\n{result.stdout}{result.stderr}")
+                    return False
+            if podcast_rows(db_path) != expected:
+                print("❌ Re-import changed the stored podcasts")
+                return False
+
+        print("✅ OPML, URL list, Apple ID and YouTube handle imports all work against the local stand-in")
+        return True
+
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    sys.exit(0 if test_podcast_import() else 1)
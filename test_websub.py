@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Check WebSub push ingestion against a local stand-in hub.
+Runs subscribe -> verification callback -> signed push -> queued entry
+without network access: python test_websub.py
+"""
+
+import sys
+import hmac
+import queue
+import hashlib
+import threading
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from websub import WebSubSubscriber, WebSubReceiver
+
+SECRET = 'stub-secret'
+CHANNEL_ID = 'UCstubchannel000000000000'
+TOPIC = f'https://www.youtube.com/feeds/videos.xml?channel_id={CHANNEL_ID}'
+DENIED_CHANNEL_ID = 'UCdeniedchannel0000000000'
+DENIED_TOPIC = f'https://www.youtube.com/feeds/videos.xml?channel_id={DENIED_CHANNEL_ID}'
+
+NOTIFICATION = f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns="http://www.w3.org/2005/Atom">
+  <link rel="hub" href="https://pubsubhubbub.appspot.com"/>
+  <link rel="self" href="{TOPIC}"/>
+  <title>YouTube video feed</title>
+  <entry>
+    <id>yt:video:stubvideo01</id>
+    <yt:videoId>stubvideo01</yt:videoId>
+    <yt:channelId>{CHANNEL_ID}</yt:channelId>
+    <title>Stub episode</title>
+    <link rel="alternate" href="https://www.youtube.com/watch?v=stubvideo01"/>
+    <published>2026-01-01T00:00:00+00:00</published>
+  </entry>
+</feed>
+""".encode('utf-8')
+
+
+class StubHub:
+    """Accepts subscriptions, verifies them against the callback, and pushes on demand."""
+
+    def __init__(self):
+        self.subscriptions = {}
+        self.requests = []
+        self.deny = set()
+        self.verified = threading.Event()
+        self.denied = threading.Event()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_address[1]}/subscribe'
+
+    def _make_handler(self):
+        hub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                params = dict(urllib.parse.parse_qsl(self.rfile.read(length).decode('utf-8')))
+                hub.requests.append(params['hub.topic'])
+                self.send_response(202)
+                self.end_headers()
+                threading.Thread(target=hub._verify, args=(params,), daemon=True).start()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _verify(self, params):
+        if params['hub.topic'] in self.deny:
+            query = urllib.parse.urlencode({
+                'hub.mode': 'denied',
+                'hub.topic': params['hub.topic'],
+                'hub.reason': 'stub refusal',
+            })
+            with urllib.request.urlopen(f"{params['hub.callback']}?{query}", timeout=5):
+                self.denied.set()
+            return
+
+        query = urllib.parse.urlencode({
+            'hub.mode': params['hub.mode'],
+            'hub.topic': params['hub.topic'],
+            'hub.challenge': 'challenge-123',
+            'hub.lease_seconds': params.get('hub.lease_seconds', '3600'),
+        })
+        with urllib.request.urlopen(f"{params['hub.callback']}?{query}", timeout=5) as response:
+            echoed = response.read().decode('utf-8')
+
+        if echoed == 'challenge-123':
+            self.subscriptions[params['hub.topic']] = params
+            self.verified.set()
+
+    def push(self, topic: str, body: bytes):
+        params = self.subscriptions[topic]
+        signature = hmac.new(params['hub.secret'].encode('utf-8'), body, hashlib.sha1).hexdigest()
+        request = urllib.request.Request(params['hub.callback'], data=body, headers={
+            'Content-Type': 'application/atom+xml',
+            'Link': f'<{topic}>; rel="self"',
+            'X-Hub-Signature': f'sha1={signature}',
+        })
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def test_websub() -> bool:
+    """Subscribe at the stub hub, answer its verification and receive a signed push."""
+    hub = StubHub()
+    receiver = None
+
+    try:
+        subscriber = WebSubSubscriber('', hub_url=hub.url, secret=SECRET, timeout=5)
+        receiver = WebSubReceiver(subscriber, host='127.0.0.1', port=0)
+        subscriber.callback_url = f'http://127.0.0.1:{receiver.port}/websub'
+        receiver.start()
+
+        podcast = {'id': 1, 'channel_name': 'Stub', 'channel_id': CHANNEL_ID, 'rss_url': TOPIC, 'source': 'youtube'}
+
+        print("Subscribing at the stub hub...")
+        subscriber.sync([podcast])
+        if not hub.verified.wait(5) or not subscriber.is_active(TOPIC):
+            print("❌ Subscription was not verified")
+            return False
+
+        print("Pushing a signed notification...")
+        status = hub.push(TOPIC, NOTIFICATION)
+        pushed_podcast, entry = receiver.queue.get(timeout=5)
+        if status != 204 or pushed_podcast['id'] != 1 or entry.get('yt_videoid') != 'stubvideo01':
+            print(f"❌ Unexpected push result: HTTP {status}, {entry.get('yt_videoid')}")
+            return False
+
+        print("Pushing a notification with a bad signature...")
+        hub.subscriptions[TOPIC]['hub.secret'] = 'wrong-secret'
+        hub.push(TOPIC, NOTIFICATION)
+        try:
+            # The receiver acknowledges before checking, so give it a moment
+            receiver.queue.get(timeout=1)
+            print("❌ Notification with a bad signature was queued")
+            return False
+        except queue.Empty:
+            pass
+
+        print("Subscribing to a topic the hub denies...")
+        hub.deny.add(DENIED_TOPIC)
+        denied_podcast = dict(podcast, id=2, channel_id=DENIED_CHANNEL_ID, rss_url=DENIED_TOPIC)
+        subscriber.sync([podcast, denied_podcast])
+        if not hub.denied.wait(5):
+            print("❌ Hub never sent the denial")
+            return False
+        hub.denied.clear()
+        subscriber.sync([podcast, denied_podcast])
+        if not hub.denied.wait(5) or hub.requests.count(DENIED_TOPIC) != 2 or hub.requests.count(TOPIC) != 1:
+            print(f"❌ Denied topic was not requested again: {hub.requests}")
+            return False
+
+        print("Re-sending a request the hub never verified...")
+        hub.deny.discard(DENIED_TOPIC)
+        hub.verified.clear()
+        subscriber.verify_timeout = 0
+        with subscriber._lock:
+            subscriber._pending[DENIED_TOPIC] = ('subscribe', 0.0)
+        subscriber.sync([podcast, denied_podcast])
+        if not hub.verified.wait(5) or not subscriber.is_active(DENIED_TOPIC):
+            print("❌ Stale pending request was not re-sent")
+            return False
+
+        print("✅ WebSub subscribe, verify, deny and push all work against the local hub")
+        return True
+
+    finally:
+        if receiver is not None:
+            receiver.stop()
+        hub.stop()
+
+
+if __name__ == '__main__':
+    sys.exit(0 if test_websub() else 1)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Text normalization stage for show notes and caption text.
+Strips HTML, decodes entities, removes rolling-caption repeats and normalizes
+whitespace in a process pool so text prep never blocks the I/O-bound stages.
+"""
+
+import re
+import html
+import logging
+from html.parser import HTMLParser
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Kinds of input the stage understands
+HTML = 'html'
+CAPTIONS = 'captions'
+
+# Caption repeats longer than this many words are left alone
+MAX_CAPTION_OVERLAP_WORDS = 30
+
+_BLOCK_TAGS = {
+    'p', 'br', 'div', 'li', 'ul', 'ol', 'tr', 'table', 'blockquote',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'section', 'article', 'header', 'footer'
+}
+_SKIP_TAGS = {'script', 'style', 'head'}
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACES_RE = re.compile(r'[ \t\r\f\v\u00a0]+')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+
+class _TextExtractor(HTMLParser):
+    """Collect visible text, turning block elements into line breaks."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+        if tag == 'li':
+            self.parts.append('- ')
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in _BLOCK_TAGS and tag != 'li':
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of spaces and blank lines, trimming every line."""
+    text = _SPACES_RE.sub(' ', text)
+    text = '\n'.join(line.strip() for line in text.split('\n'))
+    return _BLANK_LINES_RE.sub('\n\n', text).strip()
+
+
+def strip_html(text: str) -> str:
+    """Convert an HTML fragment (show notes) to plain text."""
+    parser = _TextExtractor()
+    parser.feed(text)
+    parser.close()
+    return normalize_whitespace(''.join(parser.parts))
+
+
+def clean_caption(segment: str) -> str:
+    """Decode entities (captions are often double-escaped) and drop inline markup."""
+    segment = html.unescape(html.unescape(segment))
+    return _TAG_RE.sub('', segment)
+
+
+def dedupe_captions(segments: Sequence[str]) -> str:
+    """Join caption segments, dropping words repeated from the previous line.
+
+    Rolling auto-captions repeat the tail of each line at the start of the
+    next one; the longest such overlap is removed.
+    """
+    words: List[str] = []
+
+    for segment in segments:
+        seg_words = clean_caption(segment).split()
+        if not seg_words:
+            continue
+
+        overlap = 0
+        limit = min(len(words), len(seg_words), MAX_CAPTION_OVERLAP_WORDS)
+        for k in range(limit, 0, -1):
+            if words[-k:] == seg_words[:k]:
+                overlap = k
+                break
+
+        words.extend(seg_words[overlap:])
+
+    return ' '.join(words)
+
+
+def normalize(kind: str, text: str) -> str:
+    """Normalize one input; caption segments are newline-separated."""
+    if kind == CAPTIONS:
+        return dedupe_captions(text.split('\n'))
+    return strip_html(text)
+
+
+def _normalize_batch(items: List[Tuple[str, str]]) -> List[str]:
+    """Worker: normalize a batch of small inputs in one task."""
+    return [normalize(kind, text) for kind, text in items]
+
+
+def _normalize_shared(kind: str, name: str, size: int) -> Union[int, str]:
+    """Worker: normalize a large input held in shared memory.
+
+    The result is written back into the same block and its byte length
+    returned, so neither direction pickles the text. Output that would not
+    fit (never expected: cleaning only shrinks text) is returned directly.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        text = bytes(shm.buf[:size]).decode('utf-8')
+        result = normalize(kind, text).encode('utf-8')
+        if len(result) > shm.size:
+            return result.decode('utf-8')
+        shm.buf[:len(result)] = result
+        return len(result)
+    finally:
+        shm.close()
+
+
+def _as_text(kind: str, payload: Union[str, Sequence[str]]) -> str:
+    """Flatten caption segment lists to the newline-separated wire format."""
+    if isinstance(payload, str):
+        return payload
+    return '\n'.join(segment.replace('\n', ' ') for segment in payload)
+
+
+class TextNormalizer:
+    """Run normalization in a process pool, batching small inputs.
+
+    Inputs larger than `shm_threshold` bytes are handed to workers through
+    shared memory instead of being pickled. With `workers=0` everything runs
+    inline, which is handy for tiny runs and debugging.
+    """
+
+    def __init__(self, workers: Optional[int] = None, batch_size: int = 16,
+                 shm_threshold: int = 256 * 1024):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.shm_threshold = shm_threshold
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def close(self):
+        """Shut the worker pool down."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def clean(self, kind: str, payload: Union[str, Sequence[str]]) -> str:
+        """Normalize a single input."""
+        return self.clean_many([(kind, payload)])[0]
+
+    def clean_many(self, items: Sequence[Tuple[str, Union[str, Sequence[str]]]]) -> List[str]:
+        """Normalize many inputs in parallel, preserving order."""
+        texts = [(kind, _as_text(kind, payload)) for kind, payload in items]
+
+        if self.workers == 0:
+            return _normalize_batch(texts)
+
+        pool = self._get_pool()
+        results: List[Optional[str]] = [None] * len(texts)
+        small: List[int] = []
+        shared = []
+
+        try:
+            for index, (kind, text) in enumerate(texts):
+                encoded = text.encode('utf-8')
+                if len(encoded) < self.shm_threshold:
+                    small.append(index)
+                    continue
+
+                shm = shared_memory.SharedMemory(create=True, size=len(encoded))
+                shm.buf[:len(encoded)] = encoded
+                shared.append((index, shm, pool.submit(_normalize_shared, kind, shm.name, len(encoded))))
+
+            batches = []
+            for start in range(0, len(small), self.batch_size):
+                indexes = small[start:start + self.batch_size]
+                batches.append((indexes, pool.submit(_normalize_batch, [texts[i] for i in indexes])))
+
+            for indexes, future in batches:
+                for index, text in zip(indexes, future.result()):
+                    results[index] = text
+
+            for index, shm, future in shared:
+                outcome = future.result()
+                if isinstance(outcome, int):
+                    results[index] = bytes(shm.buf[:outcome]).decode('utf-8')
+                else:
+                    results[index] = outcome
+
+        finally:
+            for _, shm, _ in shared:
+                shm.close()
+                shm.unlink()
+
+        return results
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Topic grouping of summaries for digest emails.
+Summaries are turned into hashed TF-IDF vectors with NumPy and grouped by
+average cosine similarity, so related episodes from different shows land next
+to each other. Term vectors are stored sparsely in podcasts.db; document
+frequencies for IDF come from every stored summary.
+"""
+
+import re
+import math
+import sqlite3
+import hashlib
+import logging
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Hashed feature space; collisions are rare at summary vocabulary sizes
+DIM = 2048
+
+# Rows of the similarity matrix computed per matrix product
+BLOCK_ROWS = 1024
+
+_TOKEN_RE = re.compile(r'[a-z][a-z0-9]+')
+_STOP_WORDS = {
+    'the', 'and', 'for', 'are', 'was', 'were', 'but', 'not', 'you', 'your', 'with', 'this', 'that',
+    'these', 'those', 'from', 'they', 'them', 'their', 'there', 'have', 'has', 'had', 'his', 'her',
+    'its', 'our', 'can', 'will', 'would', 'could', 'should', 'about', 'into', 'over', 'also', 'more',
+    'most', 'some', 'such', 'than', 'then', 'what', 'when', 'which', 'who', 'how', 'why', 'all',
+    'any', 'each', 'other', 'one', 'two', 'out', 'been', 'being', 'does', 'did', 'just',
+    'like', 'very', 'much', 'many', 'well', 'while', 'where', 'between', 'through', 'both',
+    # Words every summary uses regardless of topic
+    'episode', 'podcast', 'discuss', 'discusses', 'discussed', 'discussion', 'host', 'hosts',
+    'guest', 'guests', 'talk', 'talks', 'key', 'points', 'point', 'summary', 'main', 'takeaways',
+    'takeaway', 'topics', 'topic', 'video', 'speaker', 'speakers', 'including',
+}
+
+
+def summary_tokens(text: str) -> List[str]:
+    """Lower-case, accent-fold and tokenize a summary, dropping stop words."""
+    folded = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode('ascii').lower()
+    return [token for token in _TOKEN_RE.findall(folded) if token not in _STOP_WORDS]
+
+
+@lru_cache(maxsize=65536)
+def _bucket(token: str, dim: int = DIM) -> int:
+    # Stable across processes, unlike hash()
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=4).digest(), 'big') % dim
+
+
+def term_vector(text: str, dim: int = DIM) -> Tuple['np.ndarray', 'np.ndarray']:
+    """Sparse sublinear term-frequency vector of a text as (indices, weights)."""
+    buckets = Counter(_bucket(token, dim) for token in summary_tokens(text))
+    if not buckets:
+        return np.zeros(0, dtype=np.uint16), np.zeros(0, dtype=np.float32)
+
+    indices = np.fromiter(buckets.keys(), dtype=np.uint16, count=len(buckets))
+    counts = np.fromiter(buckets.values(), dtype=np.float32, count=len(buckets))
+    order = np.argsort(indices)
+    return indices[order], (1.0 + np.log(counts[order])).astype(np.float32)
+
+
+class TopicClusterer:
+    """Groups summaries by topic, with term vectors stored in podcasts.db."""
+
+    def __init__(self, db_path: str = 'podcasts.db', threshold: float = 0.3, dim: int = DIM):
+        self.db_path = db_path
+        self.threshold = threshold
+        self.dim = dim
+        self._conn = sqlite3.connect(db_path)
+        # Term vectors of this run's summaries, by video ID
+        self._vectors: Dict[str, Tuple['np.ndarray', 'np.ndarray']] = {}
+        # Number of stored summaries containing each hashed term
+        self._df = np.zeros(dim, dtype=np.int64)
+        self._docs = 0
+        self._init_database()
+
+    @staticmethod
+    def is_available() -> bool:
+        return np is not None
+
+    def _init_database(self):
+        """Create the vector table, backfill stored summaries and load document frequencies."""
+        try:
+            cursor = self._conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS summary_vectors (
+                    video_id TEXT PRIMARY KEY,
+                    dim INTEGER NOT NULL,
+                    indices BLOB NOT NULL,
+                    weights BLOB NOT NULL
+                )
+            ''')
+            self._conn.commit()
+            self._backfill()
+
+            cursor.execute('SELECT indices FROM summary_vectors WHERE dim = ?', (self.dim,))
+            chunks = [np.frombuffer(blob, dtype=np.uint16) for (blob,) in cursor.fetchall()]
+            self._docs = len(chunks)
+            if chunks:
+                self._df = np.bincount(np.concatenate(chunks), minlength=self.dim).astype(np.int64)
+        except sqlite3.Error as e:
+            logger.error("Topic index initialization error: %s", e)
+            raise
+
+    def _backfill(self):
+        """Vectorize stored summaries that predate the vector table."""
+        cursor = self._conn.cursor()
+        try:
+            cursor.execute('''
+                SELECT s.video_id, s.summary
+                FROM summaries s
+                LEFT JOIN summary_vectors v ON v.video_id = s.video_id AND v.dim = ?
+                WHERE v.video_id IS NULL
+            ''', (self.dim,))
+        except sqlite3.OperationalError:
+            # No summaries table yet
+            return
+
+        rows = cursor.fetchall()
+        if rows:
+            cursor.executemany(
+                'INSERT OR REPLACE INTO summary_vectors (video_id, dim, indices, weights) VALUES (?, ?, ?, ?)',
+                [(video_id, self.dim, *(part.tobytes() for part in term_vector(summary, self.dim)))
+                 for video_id, summary in rows]
+            )
+            self._conn.commit()
+            logger.info("Vectorized %s stored summaries for topic grouping", len(rows))
+
+    def add(self, video_id: str, summary: str):
+        """Store the term vector of a new summary."""
+        indices, weights = term_vector(summary, self.dim)
+        self._vectors[video_id] = (indices, weights)
+        try:
+            cursor = self._conn.execute(
+                'INSERT OR IGNORE INTO summary_vectors (video_id, dim, indices, weights) VALUES (?, ?, ?, ?)',
+                (video_id, self.dim, indices.tobytes(), weights.tobytes())
+            )
+            self._conn.commit()
+            if cursor.rowcount:
+                np.add.at(self._df, indices.astype(np.intp), 1)
+                self._docs += 1
+        except sqlite3.Error as e:
+            logger.error("Topic index insert error: %s", e)
+
+    def _idf(self) -> 'np.ndarray':
+        return (np.log((1.0 + self._docs) / (1.0 + self._df)) + 1.0).astype(np.float32)
+
+    def _load_vectors(self, video_ids: List[str]) -> Dict[str, Tuple['np.ndarray', 'np.ndarray']]:
+        """Fetch stored term vectors, in chunks that fit SQLite's parameter limit."""
+        vectors = {}
+        for start in range(0, len(video_ids), 500):
+            chunk = video_ids[start:start + 500]
+            cursor = self._conn.execute(
+                f'SELECT video_id, indices, weights FROM summary_vectors '
+                f'WHERE dim = ? AND video_id IN ({",".join("?" * len(chunk))})',
+                [self.dim] + chunk
+            )
+            for video_id, indices, weights in cursor:
+                vectors[video_id] = (np.frombuffer(indices, dtype=np.uint16), np.frombuffer(weights, dtype=np.float32))
+        return vectors
+
+    def _matrix(self, items: List[Dict], idf: 'np.ndarray') -> 'np.ndarray':
+        """L2-normalized TF-IDF rows for the items (stored vectors are reused by video ID)."""
+        missing = [item['video_id'] for item in items
+                   if item.get('video_id') and item['video_id'] not in self._vectors]
+        stored = self._load_vectors(missing) if missing else {}
+
+        vectors = []
+        for item in items:
+            video_id = item.get('video_id')
+            vector = self._vectors.get(video_id) or stored.get(video_id)
+            vectors.append(vector if vector is not None else term_vector(item['summary'], self.dim))
+
+        lengths = [len(indices) for indices, _ in vectors]
+        rows = np.repeat(np.arange(len(items)), lengths)
+        matrix = np.zeros((len(items), self.dim), dtype=np.float32)
+        if rows.size:
+            columns = np.concatenate([indices for indices, _ in vectors]).astype(np.intp)
+            matrix[rows, columns] = np.concatenate([weights for _, weights in vectors])
+
+        matrix *= idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def cluster(self, items: List[Dict]) -> List[List[int]]:
+        """Group item positions by topic, largest group first.
+
+        Similarities are computed in row blocks of one matrix product each.
+        An item joins the earlier group it is most similar to on average if
+        that reaches the threshold, otherwise it starts a new group.
+        """
+        if not items:
+            return []
+
+        matrix = self._matrix(items, self._idf())
+        assignment = np.empty(len(items), dtype=np.intp)
+        sizes: List[int] = []
+
+        for start in range(0, len(items), BLOCK_ROWS):
+            block = matrix[start:start + BLOCK_ROWS] @ matrix[:start + BLOCK_ROWS].T
+
+            for offset, scores in enumerate(block):
+                row = start + offset
+                if sizes:
+                    totals = np.bincount(assignment[:row], weights=scores[:row], minlength=len(sizes))
+                    averages = totals / np.asarray(sizes)
+                    best = int(np.argmax(averages))
+                    if averages[best] >= self.threshold:
+                        assignment[row] = best
+                        sizes[best] += 1
+                        continue
+                assignment[row] = len(sizes)
+                sizes.append(1)
+
+        groups: List[List[int]] = [[] for _ in sizes]
+        for row, group in enumerate(assignment):
+            groups[group].append(row)
+        return sorted(groups, key=len, reverse=True)
+
+    def _label(self, texts: List[str], idf: 'np.ndarray', terms: int = 3) -> str:
+        """Name a group after its highest-weighted terms."""
+        scores: Counter = Counter()
+        for text in texts:
+            counts = Counter(summary_tokens(text))
+            for token, count in counts.items():
+                scores[token] += (1.0 + math.log(count)) * float(idf[_bucket(token, self.dim)])
+        return ', '.join(token for token, _ in scores.most_common(terms))
+
+    def group(self, items: List[Dict]) -> List[Tuple[Optional[str], List[Dict]]]:
+        """Return (label, items) topic groups; single episodes get no label."""
+        idf = self._idf()
+        groups = []
+        for rows in self.cluster(items):
+            group_items = [items[row] for row in rows]
+            label = self._label([item['summary'] for item in group_items], idf) if len(rows) > 1 else None
+            groups.append((label, group_items))
+        return groups
+
+    def close(self):
+        self._conn.close()
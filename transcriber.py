@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Local CPU speech-to-text for podcast episodes that have no YouTube transcript.
+Streams the enclosure audio to disk, splits it into overlapping chunks and
+transcribes the chunks in parallel with a process pool running faster-whisper.
+
+Requires the optional `faster-whisper` package and the `ffmpeg`/`ffprobe` binaries.
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+import tempfile
+import subprocess
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    # faster-whisper not installed, local transcription is unavailable
+    WhisperModel = None
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+# Per-process model, loaded once by the pool initializer
+_worker_model = None
+
+
+def _init_worker(model_size: str, compute_type: str):
+    """Load the model once in each worker process."""
+    global _worker_model
+    # One thread per process: parallelism comes from the pool, not from BLAS
+    _worker_model = WhisperModel(model_size, device='cpu', compute_type=compute_type,
+                                 cpu_threads=1, num_workers=1)
+
+
+def _decode_chunk(audio_path: str, start: float, duration: float):
+    """Decode [start, start + duration) of the file to 16 kHz mono float32."""
+    import numpy as np
+
+    cmd = [
+        'ffmpeg', '-nostdin', '-loglevel', 'error',
+        '-ss', f'{start:.3f}', '-t', f'{duration:.3f}', '-i', audio_path,
+        '-f', 's16le', '-ac', '1', '-ar', str(SAMPLE_RATE), '-'
+    ]
+    pcm = subprocess.run(cmd, check=True, capture_output=True).stdout
+    return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def _transcribe_chunk(audio_path: str, start: float, duration: float,
+                      language: Optional[str]) -> List[Tuple[float, float, str]]:
+    """Transcribe one chunk, returning segments with absolute timestamps."""
+    audio = _decode_chunk(audio_path, start, duration)
+    segments, _ = _worker_model.transcribe(audio, language=language, beam_size=1,
+                                           vad_filter=True)
+    return [(start + seg.start, start + seg.end, seg.text.strip()) for seg in segments]
+
+
+def plan_chunks(total: float, chunk_seconds: float, overlap: float) -> List[Tuple[float, float]]:
+    """Split [0, total) into (start, duration) windows that overlap by `overlap`."""
+    chunks = []
+    start = 0.0
+    while start < total:
+        duration = min(chunk_seconds + overlap, total - start)
+        chunks.append((start, duration))
+        start += chunk_seconds
+    return chunks
+
+
+def merge_segments(chunk_segments: List[List[Tuple[float, float, str]]],
+                   chunks: List[Tuple[float, float]], overlap: float) -> str:
+    """Join chunk transcripts, keeping each overlapped segment only once.
+
+    Every chunk owns the audio from the midpoint of its leading overlap to the
+    midpoint of its trailing overlap; segments are attributed by start time.
+    """
+    half = overlap / 2
+    texts = []
+
+    for i, (segments, (start, _)) in enumerate(zip(chunk_segments, chunks)):
+        own_from = start + half if i > 0 else float('-inf')
+        own_to = chunks[i + 1][0] + half if i + 1 < len(chunks) else float('inf')
+        texts.extend(text for seg_start, _, text in segments
+                     if own_from <= seg_start < own_to and text)
+
+    return ' '.join(texts)
+
+
+def find_enclosure_url(entry) -> Optional[str]:
+    """Return the audio enclosure URL of a feed entry, if present."""
+    for enclosure in entry.get('enclosures', []) or []:
+        if enclosure.get('type', 'audio/').startswith('audio/') and enclosure.get('href'):
+            return enclosure['href']
+
+    for link in entry.get('links', []) or []:
+        if link.get('rel') == 'enclosure' and link.get('href'):
+            return link['href']
+
+    return None
+
+
+class LocalTranscriber:
+    """Transcribe episode audio on local CPU cores."""
+
+    def __init__(self, model_size: str = 'base.en', workers: Optional[int] = None,
+                 chunk_seconds: int = 300, overlap_seconds: int = 5,
+                 compute_type: str = 'int8', language: Optional[str] = 'en'):
+        self.model_size = model_size
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_seconds = chunk_seconds
+        self.overlap_seconds = overlap_seconds
+        self.compute_type = compute_type
+        self.language = language
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @staticmethod
+    def is_available() -> bool:
+        """Check that the optional model package and ffmpeg are installed."""
+        return WhisperModel is not None and shutil.which('ffmpeg') is not None \
+            and shutil.which('ffprobe') is not None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Create the worker pool lazily and keep it (and its models) warm."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.model_size, self.compute_type)
+            )
+        return self._pool
+
+    def close(self):
+        """Shut the worker pool down."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    @staticmethod
+    def _download(url: str, dest_dir: str, timeout: float = 30.0) -> str:
+        """Stream the enclosure to a temporary file without buffering it in memory."""
+        path = os.path.join(dest_dir, 'episode_audio')
+        request = urllib.request.Request(url, headers={'User-Agent': 'rss-whisperer'})
+
+        with urllib.request.urlopen(request, timeout=timeout) as response, open(path, 'wb') as f:
+            while True:
+                block = response.read(DOWNLOAD_CHUNK_BYTES)
+                if not block:
+                    break
+                f.write(block)
+
+        return path
+
+    @staticmethod
+    def _probe_duration(audio_path: str) -> float:
+        """Return the audio duration in seconds."""
+        cmd = ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'json', audio_path]
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        return float(json.loads(result.stdout)['format']['duration'])
+
+    def transcribe_url(self, url: str) -> Optional[Dict]:
+        """Download and transcribe an episode.
+
+        Returns a dict with the transcript text, audio seconds, wall seconds and
+        throughput (audio hours per wall-clock hour), or None on failure.
+        """
+        if not self.is_available():
+            logger.warning("Local transcription requested but faster-whisper/ffmpeg is not installed")
+            return None
+
+        started = time.monotonic()
+
+        try:
+            with tempfile.TemporaryDirectory(prefix='rss-whisperer-') as tmp:
+                audio_path = self._download(url, tmp)
+                total = self._probe_duration(audio_path)
+                chunks = plan_chunks(total, self.chunk_seconds, self.overlap_seconds)
+
+                logger.info("Transcribing %.1f min of audio in %s chunks across %s workers", total / 60, len(chunks), self.workers)
+
+                pool = self._get_pool()
+                futures = [pool.submit(_transcribe_chunk, audio_path, start, duration, self.language)
+                           for start, duration in chunks]
+                chunk_segments = [future.result() for future in futures]
+
+            transcript = merge_segments(chunk_segments, chunks, self.overlap_seconds)
+
+        except Exception as e:
+            logger.error("Local transcription failed for %s: %s", url, e)
+            return None
+
+        wall = time.monotonic() - started
+        throughput = total / wall if wall > 0 else 0.0
+        logger.info("Local transcription: %.2f h audio in %.1f s (%.1f audio h per wall-clock h, %s workers)", total / 3600, wall, throughput, self.workers)
+
+        return {
+            'transcript': transcript,
+            'audio_seconds': total,
+            'wall_seconds': wall,
+            'throughput': throughput,
+        }
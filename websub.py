@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+WebSub (PubSubHubbub) push ingestion for YouTube channel feeds.
+Subscribes each YouTube podcast at the hub, answers verification callbacks and
+queues pushed video entries so they can be summarized within seconds.
+"""
+
+import hmac
+import time
+import queue
+import logging
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+import feedparser
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HUB_URL = 'https://pubsubhubbub.appspot.com/subscribe'
+DEFAULT_LEASE_SECONDS = 5 * 24 * 3600
+# A request the hub accepted but never verified is sent again after this long
+DEFAULT_VERIFY_TIMEOUT = 10 * 60
+
+
+def _is_youtube_topic(topic: str) -> bool:
+    """Return True for YouTube channel feed URLs that the hub can push."""
+    return 'youtube.com/feeds/videos.xml' in topic and 'channel_id=' in topic
+
+
+def _channel_id_from_topic(topic: str) -> Optional[str]:
+    """Extract the channel_id query parameter from a YouTube feed URL."""
+    query = urllib.parse.urlparse(topic).query
+    values = urllib.parse.parse_qs(query).get('channel_id')
+    return values[0] if values else None
+
+
+class WebSubSubscriber:
+    """Track hub subscriptions and the podcasts they belong to."""
+
+    def __init__(self, callback_url: str, hub_url: str = DEFAULT_HUB_URL,
+                 secret: Optional[str] = None, lease_seconds: int = DEFAULT_LEASE_SECONDS,
+                 timeout: float = 10.0, verify_timeout: float = DEFAULT_VERIFY_TIMEOUT):
+        self.callback_url = callback_url
+        self.hub_url = hub_url
+        self.secret = secret
+        self.lease_seconds = lease_seconds
+        self.timeout = timeout
+        self.verify_timeout = verify_timeout
+
+        self._lock = threading.Lock()
+        # topic -> podcast dict
+        self._podcasts: Dict[str, Dict] = {}
+        # topic -> lease expiry (epoch seconds); only set once the hub verified
+        self._leases: Dict[str, float] = {}
+        # topic -> (mode, request time) of a request in flight awaiting verification
+        self._pending: Dict[str, Tuple[str, float]] = {}
+
+    def sync(self, podcasts: List[Dict]):
+        """Subscribe new YouTube podcasts, renew expiring leases, drop removed ones."""
+        wanted = {p['rss_url']: p for p in podcasts
+                  if p.get('source', 'youtube') == 'youtube' and _is_youtube_topic(p['rss_url'])}
+
+        with self._lock:
+            removed = [topic for topic in self._podcasts if topic not in wanted]
+            self._podcasts = dict(wanted)
+
+        for topic in removed:
+            self._request(topic, 'unsubscribe')
+
+        # Renew once less than a tenth of the lease remains
+        now = time.time()
+        renew_before = now + self.lease_seconds / 10
+        for topic in wanted:
+            with self._lock:
+                expiry = self._leases.get(topic)
+                request = self._pending.get(topic)
+            # Still waiting for the hub, unless it never verified and the request is stale
+            pending = request is not None and request[1] > now - self.verify_timeout
+            if pending or (expiry is not None and expiry > renew_before):
+                continue
+            self._request(topic, 'subscribe')
+
+    def _request(self, topic: str, mode: str) -> bool:
+        """Send a subscribe/unsubscribe request to the hub."""
+        params = {
+            'hub.callback': self.callback_url,
+            'hub.topic': topic,
+            'hub.mode': mode,
+            'hub.verify': 'async',
+        }
+        if mode == 'subscribe':
+            params['hub.lease_seconds'] = str(self.lease_seconds)
+            if self.secret:
+                params['hub.secret'] = self.secret
+
+        data = urllib.parse.urlencode(params).encode('utf-8')
+
+        with self._lock:
+            self._pending[topic] = (mode, time.time())
+
+        try:
+            with urllib.request.urlopen(self.hub_url, data=data, timeout=self.timeout) as response:
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except (urllib.error.URLError, OSError) as e:
+            logger.error("WebSub hub unreachable for %s: %s", topic, e)
+            with self._lock:
+                self._pending.pop(topic, None)
+            return False
+
+        if status not in (202, 204):
+            logger.error("WebSub %s rejected for %s (HTTP %s)", mode, topic, status)
+            with self._lock:
+                self._pending.pop(topic, None)
+            return False
+
+        logger.info("WebSub %s requested for %s", mode, topic)
+        return True
+
+    def verify(self, mode: str, topic: str, lease_seconds: Optional[str]) -> bool:
+        """Confirm a hub verification request matches an intent we sent."""
+        with self._lock:
+            request = self._pending.get(topic)
+            if request is None or request[0] != mode:
+                return False
+
+            self._pending.pop(topic, None)
+
+            if mode == 'subscribe':
+                try:
+                    lease = int(lease_seconds) if lease_seconds else self.lease_seconds
+                except ValueError:
+                    lease = self.lease_seconds
+                self._leases[topic] = time.time() + lease
+            else:
+                self._leases.pop(topic, None)
+
+        logger.info("WebSub %s verified for %s", mode, topic)
+        return True
+
+    def denied(self, topic: Optional[str], reason: Optional[str]):
+        """Forget a subscription the hub refused, so the next sync asks again."""
+        logger.warning("WebSub subscription denied for %s: %s", topic, reason)
+        with self._lock:
+            self._pending.pop(topic, None)
+            self._leases.pop(topic, None)
+
+    def is_active(self, topic: str) -> bool:
+        """Return True while the hub holds a verified, unexpired lease for topic."""
+        with self._lock:
+            expiry = self._leases.get(topic)
+        return expiry is not None and expiry > time.time()
+
+    def podcast_for(self, topic: Optional[str], channel_id: Optional[str]) -> Optional[Dict]:
+        """Look up the podcast a notification belongs to."""
+        with self._lock:
+            if topic and topic in self._podcasts:
+                return self._podcasts[topic]
+            if channel_id:
+                for podcast_topic, podcast in self._podcasts.items():
+                    if podcast.get('channel_id') == channel_id or \
+                            _channel_id_from_topic(podcast_topic) == channel_id:
+                        return podcast
+        return None
+
+    def signature_valid(self, body: bytes, header: Optional[str]) -> bool:
+        """Check the X-Hub-Signature header against the shared secret."""
+        if not self.secret:
+            return True
+        if not header or '=' not in header:
+            return False
+
+        algorithm, digest = header.split('=', 1)
+        if algorithm not in ('sha1', 'sha256', 'sha384', 'sha512'):
+            return False
+
+        expected = hmac.new(self.secret.encode('utf-8'), body, algorithm).hexdigest()
+        return hmac.compare_digest(expected, digest)
+
+
+def parse_notification(body: bytes) -> Tuple[Optional[str], List]:
+    """Parse a pushed Atom document into (topic, entries)."""
+    feed = feedparser.parse(body)
+
+    topic = None
+    for link in feed.feed.get('links', []):
+        if link.get('rel') == 'self':
+            topic = link.get('href')
+            break
+
+    return topic, list(feed.entries)
+
+
+class WebSubReceiver:
+    """HTTP callback endpoint that verifies subscriptions and queues pushed entries.
+
+    Queued items are ``(podcast, entry)`` tuples in the same shape
+    ``IntegratedSummarizer._process_entry`` consumes for polled feeds.
+    """
+
+    def __init__(self, subscriber: WebSubSubscriber, host: str = '0.0.0.0', port: int = 8085):
+        self.subscriber = subscriber
+        self.queue: 'queue.Queue[Tuple[Dict, object]]' = queue.Queue()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def _make_handler(self):
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+
+                def param(name):
+                    values = params.get(name)
+                    return values[0] if values else None
+
+                mode = param('hub.mode')
+                topic = param('hub.topic')
+                challenge = param('hub.challenge')
+
+                if mode == 'denied':
+                    receiver.subscriber.denied(topic, param('hub.reason'))
+                    self._reply(200)
+                    return
+
+                if not (mode and topic and challenge) or \
+                        not receiver.subscriber.verify(mode, topic, param('hub.lease_seconds')):
+                    self._reply(404)
+                    return
+
+                self._reply(200, challenge.encode('utf-8'))
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length)
+
+                # Always acknowledge so the hub does not retry; bad payloads are dropped
+                self._reply(204)
+
+                if not receiver.subscriber.signature_valid(body, self.headers.get('X-Hub-Signature')):
+                    logger.warning("Ignoring WebSub notification with invalid signature")
+                    return
+
+                receiver._enqueue(body, self._topic_from_link_header())
+
+            def _topic_from_link_header(self) -> Optional[str]:
+                for part in (self.headers.get('Link') or '').split(','):
+                    if 'rel="self"' in part or "rel=self" in part:
+                        return part.split(';')[0].strip().strip('<>')
+                return None
+
+            def _reply(self, status: int, body: bytes = b''):
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("WebSub callback: " + format, *args)
+
+        return Handler
+
+    def _enqueue(self, body: bytes, header_topic: Optional[str]):
+        """Match pushed entries to their podcast and queue them."""
+        topic, entries = parse_notification(body)
+        topic = topic or header_topic
+
+        for entry in entries:
+            podcast = self.subscriber.podcast_for(topic, entry.get('yt_channelid'))
+            if podcast is None:
+                logger.warning("WebSub notification for unknown topic %s", topic)
+                continue
+
+            logger.info("WebSub push: %s (%s)", entry.get('title', 'Unknown Title'), entry.get('yt_videoid'))
+            self.queue.put((podcast, entry))
+
+    def start(self):
+        """Serve callbacks on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name='websub', daemon=True)
+        self._thread.start()
+        logger.info("WebSub receiver listening on port %s", self.port)
+
+    def stop(self):
+        """Shut the callback server down."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()